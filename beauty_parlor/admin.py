@@ -1,5 +1,37 @@
-from django.contrib import admin
-from .models import Service, Testimonial, Contact, Booking, UserProfile, Review
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import ChangeList
+from . import bookings, exports, jobs
+from .pagination import EstimatedCountPaginator
+from .models import Service, Testimonial, Contact, Booking, UserProfile, Review, Job, Area, Itinerary, ItineraryStop
+
+class ExportActionsMixin:
+    """Stream the selected rows (or, with "select all", the whole filtered list) as CSV or NDJSON."""
+    export_columns = []
+    export_name = 'export'
+    actions = ['export_csv', 'export_ndjson']
+
+    @admin.action(description='Export selected as CSV', permissions=['view'])
+    def export_csv(self, request, queryset):
+        return exports.streaming_response(queryset, self.export_columns, 'csv', self.export_name)
+
+    @admin.action(description='Export selected as NDJSON', permissions=['view'])
+    def export_ndjson(self, request, queryset):
+        return exports.streaming_response(queryset, self.export_columns, 'ndjson', self.export_name)
+
+class EstimatedCountChangeList(ChangeList):
+    def get_results(self, request):
+        super().get_results(request)
+        # The paginator corrects an overshooting estimate once a page reaches the end of the table
+        self.result_count = self.paginator.count
+        self.page_num = min(self.page_num, self.paginator.num_pages)
+
+class LargeTableAdminMixin:
+    """Changelists for tables that grow without bound: no exact COUNT(*) of the whole table per page load."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return EstimatedCountChangeList
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
@@ -10,7 +42,7 @@ class UserProfileAdmin(admin.ModelAdmin):
 
 @admin.register(Service)
 class ServiceAdmin(admin.ModelAdmin):
-    list_display = ['name', 'category', 'price', 'duration', 'is_home_service', 'created_at']
+    list_display = ['name', 'category', 'price', 'duration', 'is_home_service', 'rating_average', 'rating_count', 'created_at']
     list_filter = ['category', 'is_home_service', 'created_at']
     search_fields = ['name', 'description']
     list_editable = ['price', 'duration', 'is_home_service']
@@ -22,24 +54,87 @@ class TestimonialAdmin(admin.ModelAdmin):
     search_fields = ['name', 'service', 'comment']
 
 @admin.register(Contact)
-class ContactAdmin(admin.ModelAdmin):
+class ContactAdmin(ExportActionsMixin, admin.ModelAdmin):
     list_display = ['name', 'email', 'subject', 'created_at']
     list_filter = ['created_at']
     search_fields = ['name', 'email', 'subject', 'message']
     readonly_fields = ['created_at']
+    export_columns = exports.CONTACT_COLUMNS
+    export_name = 'contacts'
 
 @admin.register(Booking)
-class BookingAdmin(admin.ModelAdmin):
+class BookingAdmin(LargeTableAdminMixin, ExportActionsMixin, admin.ModelAdmin):
     list_display = ['user', 'service', 'date', 'time', 'status', 'total_amount', 'created_at']
+    list_select_related = ['user', 'service']
+    # Each filter is served by an index (see Booking.Meta.indexes)
     list_filter = ['status', 'date', 'created_at', 'is_home_service']
     search_fields = ['user__username', 'user__first_name', 'user__last_name', 'service__name']
-    list_editable = ['status']
     readonly_fields = ['created_at', 'updated_at', 'total_amount']
-    date_hierarchy = 'created_at'
+    export_columns = exports.BOOKING_COLUMNS
+    export_name = 'bookings'
+    actions = ['mark_confirmed', 'mark_completed', 'mark_cancelled', 'export_csv', 'export_ndjson']
+
+    def _transition(self, request, queryset, status):
+        selected = queryset.count()
+        moved = bookings.transition(queryset, status)
+        message = f'{moved} bookings marked {status}.'
+        if moved < selected:
+            message += f' {selected - moved} were skipped: their status cannot move to {status}.'
+        self.message_user(request, message, messages.SUCCESS if moved else messages.WARNING)
+
+    @admin.action(description='Mark selected bookings confirmed (pending only)', permissions=['change'])
+    def mark_confirmed(self, request, queryset):
+        self._transition(request, queryset, 'confirmed')
+
+    @admin.action(description='Mark selected bookings completed (confirmed only)', permissions=['change'])
+    def mark_completed(self, request, queryset):
+        self._transition(request, queryset, 'completed')
+
+    @admin.action(description='Cancel selected bookings (pending or confirmed)', permissions=['change'])
+    def mark_cancelled(self, request, queryset):
+        self._transition(request, queryset, 'cancelled')
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ['user', 'booking', 'rating', 'created_at']
+    # Booking.__str__ shows the booking's user and service
+    list_select_related = ['user', 'booking__user', 'booking__service']
     list_filter = ['rating', 'created_at']
     search_fields = ['user__username', 'booking__service__name', 'comment']
-    readonly_fields = ['created_at'] 
\ No newline at end of file
+    readonly_fields = ['created_at']
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'name', 'status', 'attempts', 'run_at', 'locked_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'name']
+    readonly_fields = ['payload', 'attempts', 'locked_at', 'locked_by', 'last_error', 'created_at', 'finished_at']
+    actions = ['retry_jobs']
+
+    @admin.action(description='Retry selected jobs now')
+    def retry_jobs(self, request, queryset):
+        self.message_user(request, f'{jobs.retry(queryset)} jobs queued again.')
+
+@admin.register(Area)
+class AreaAdmin(admin.ModelAdmin):
+    list_display = ['name', 'pincode', 'latitude', 'longitude']
+    search_fields = ['name', 'pincode']
+
+class ItineraryStopInline(admin.TabularInline):
+    model = ItineraryStop
+    fields = ['position', 'start_time', 'end_time', 'travel_minutes', 'area', 'booking']
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('area', 'booking__user', 'booking__service')
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+@admin.register(Itinerary)
+class ItineraryAdmin(admin.ModelAdmin):
+    list_display = ['date', 'number', 'zone', 'start_time', 'end_time', 'visits', 'service_minutes', 'travel_minutes']
+    list_filter = ['date', 'zone']
+    readonly_fields = ['date', 'zone', 'number', 'start_time', 'end_time', 'visits', 'service_minutes', 'travel_minutes', 'planned_at']
+    inlines = [ItineraryStopInline]
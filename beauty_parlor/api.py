@@ -0,0 +1,252 @@
+"""
+JSON API for the mobile client, next to the HTML views.
+
+    GET  /api/services/                    ?category= &search= &fields= &cursor= &limit=
+    GET  /api/services/<id>/               ?fields=
+    GET  /api/services/<id>/availability/  ?date=YYYY-MM-DD
+    GET  /api/bookings/                    ?status= &date_from= &date_to= &fields= &cursor= &limit=
+    POST /api/bookings/                    JSON body, optional Idempotency-Key header
+    POST /api/bookings/<id>/cancel/
+
+Lists are keyset-paginated: pass the ``next`` cursor back to get the following
+page. ``fields=id,name`` returns only those fields, and the query only loads
+the columns they need; related rows come from the same query, never one per
+row. Bookings use the site's session login, so writes need the X-CSRFToken
+header like any form post.
+
+Catalog responses are the same for everyone and are cacheable by shared
+caches. Booking responses are private. Both carry ETags (see conditional.py),
+so revalidating an unchanged page costs one aggregate query.
+"""
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+from django.http import Http404, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.csrf import ensure_csrf_cookie
+
+from . import views
+from .bookings import SlotUnavailable, create_booking, find_by_key
+from .conditional import conditional_on
+from .forms import BookingForm
+from .models import Booking, Service
+from .pagination import keyset_page, ordered_page, ranked_page
+from .search import fts_available, ranked_service_ids, search_services
+from .views import _my_bookings_query
+
+PAGE_SIZE = getattr(settings, 'API_PAGE_SIZE', 20)
+MAX_PAGE_SIZE = 100
+CATALOG_MAX_AGE = getattr(settings, 'API_CATALOG_MAX_AGE', 60)
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400, **extra):
+        super().__init__(message)
+        self.status = status
+        self.extra = extra
+
+
+def endpoint(methods=('GET',), login=False):
+    """Reject other methods and anonymous users with JSON errors, and render ApiError as JSON."""
+    def decorator(view):
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            if request.method not in methods and not (request.method == 'HEAD' and 'GET' in methods):
+                response = JsonResponse({'error': f'{request.method} is not allowed here.'}, status=405)
+                response['Allow'] = ', '.join(methods)
+                return response
+            if login and not request.user.is_authenticated:
+                return JsonResponse({'error': 'Log in first.'}, status=401)
+            try:
+                return view(request, *args, **kwargs)
+            except ApiError as error:
+                return JsonResponse({'error': str(error), **error.extra}, status=error.status)
+            except Http404 as error:
+                return JsonResponse({'error': str(error) or 'Not found.'}, status=404)
+        return inner
+    return decorator
+
+
+class Fields:
+    """
+    A resource's fields, each declared as (model columns it needs, getter).
+    ``select()`` reads ``?fields=``, ``columns()`` feeds ``.only()`` and
+    ``dump()`` builds the dict for one object.
+    """
+
+    def __init__(self, **fields):
+        self.fields = fields
+
+    def select(self, request):
+        requested = [name.strip() for name in request.GET.get('fields', '').split(',') if name.strip()]
+        if not requested:
+            return list(self.fields)
+        unknown = [name for name in requested if name not in self.fields]
+        if unknown:
+            raise ApiError(f"Unknown fields: {', '.join(unknown)}. Choose from: {', '.join(self.fields)}.")
+        return list(dict.fromkeys(requested))
+
+    def columns(self, names, *always):
+        return list(dict.fromkeys([*always, *(column for name in names for column in self.fields[name][0])]))
+
+    def dump(self, obj, names):
+        return {name: self.fields[name][1](obj) for name in names}
+
+
+SERVICE_FIELDS = Fields(
+    id=(['id'], lambda service: service.id),
+    name=(['name'], lambda service: service.name),
+    description=(['description'], lambda service: service.description),
+    category=(['category'], lambda service: service.category),
+    price=(['price'], lambda service: str(service.price)),
+    duration=(['duration'], lambda service: service.duration),
+    is_home_service=(['is_home_service'], lambda service: service.is_home_service),
+    image=(['image'], lambda service: service.image.url if service.image else None),
+    rating=(
+        ['rating_average', 'rating_count'],
+        lambda service: {'average': round(service.rating_average, 2), 'count': service.rating_count},
+    ),
+)
+
+BOOKING_FIELDS = Fields(
+    id=(['id'], lambda booking: booking.id),
+    service=(
+        ['service', 'service__id', 'service__name', 'service__price'],
+        lambda booking: {'id': booking.service.id, 'name': booking.service.name, 'price': str(booking.service.price)},
+    ),
+    date=(['date'], lambda booking: booking.date.isoformat()),
+    time=(['time'], lambda booking: booking.time.strftime('%H:%M')),
+    address=(['address'], lambda booking: booking.address),
+    is_home_service=(['is_home_service'], lambda booking: booking.is_home_service),
+    status=(['status'], lambda booking: booking.status),
+    special_requests=(['special_requests'], lambda booking: booking.special_requests),
+    total_amount=(['total_amount'], lambda booking: str(booking.total_amount) if booking.total_amount is not None else None),
+    created_at=(['created_at'], lambda booking: booking.created_at.isoformat()),
+    updated_at=(['updated_at'], lambda booking: booking.updated_at.isoformat()),
+)
+
+
+def _limit(request):
+    try:
+        limit = int(request.GET.get('limit', PAGE_SIZE))
+    except ValueError:
+        raise ApiError('limit must be a number.')
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def _catalog_response(data):
+    response = JsonResponse(data)
+    patch_cache_control(response, public=True, max_age=CATALOG_MAX_AGE)
+    return response
+
+
+def _private_response(data, status=200):
+    response = JsonResponse(data, status=status)
+    # Stored by the client only, and revalidated with its ETag before every reuse
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@endpoint()
+@conditional_on(Service, public=True)
+def services(request):
+    names = SERVICE_FIELDS.select(request)
+    limit = _limit(request)
+    cursor = request.GET.get('cursor')
+    category = request.GET.get('category', '')
+    search_query = request.GET.get('search', '').strip()
+
+    # name and id are the cursor's position, so they're loaded even when not requested
+    queryset = Service.objects.only(*SERVICE_FIELDS.columns(names, 'id', 'name'))
+    if category:
+        queryset = queryset.filter(category=category)
+    if search_query and fts_available():
+        try:
+            ids = ranked_service_ids(search_query, category or None)
+        except OperationalError:
+            ids = []
+        rows, next_cursor = ranked_page(queryset, ids, cursor, limit)
+    else:
+        if search_query:
+            queryset = search_services(queryset, search_query)
+        rows, next_cursor = ordered_page(queryset, 'name', cursor, limit)
+
+    return _catalog_response({
+        'results': [SERVICE_FIELDS.dump(service, names) for service in rows],
+        'next': next_cursor,
+    })
+
+
+@endpoint()
+@conditional_on(Service, public=True)
+def service_detail(request, service_id):
+    names = SERVICE_FIELDS.select(request)
+    service = Service.objects.only(*SERVICE_FIELDS.columns(names, 'id')).filter(id=service_id).first()
+    if service is None:
+        raise ApiError('Service not found.', status=404)
+    return _catalog_response(SERVICE_FIELDS.dump(service, names))
+
+
+availability = endpoint()(views.availability)
+
+
+@endpoint(methods=('GET', 'POST'), login=True)
+@ensure_csrf_cookie
+@conditional_on(Booking, owner='user')
+def bookings(request):
+    if request.method == 'POST':
+        return _create_booking(request)
+
+    names = BOOKING_FIELDS.select(request)
+    queryset, _ = _my_bookings_query(request, request.user)
+    if 'service' not in names:
+        queryset = queryset.select_related(None)
+    queryset = queryset.only(*BOOKING_FIELDS.columns(names, 'id', 'created_at'))
+    rows, next_cursor = keyset_page(queryset, request.GET.get('cursor'), page_size=_limit(request))
+    return _private_response({
+        'results': [BOOKING_FIELDS.dump(booking, names) for booking in rows],
+        'next': next_cursor,
+    })
+
+
+def _create_booking(request):
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        raise ApiError('Send the booking as a JSON object.')
+    if not isinstance(data, dict):
+        raise ApiError('Send the booking as a JSON object.')
+
+    idempotency_key = request.headers.get('Idempotency-Key', '')[:64]
+    # A retried request gets its original booking back, even once the slot has passed
+    existing = find_by_key(request.user, idempotency_key)
+    if existing is not None:
+        return _private_response(BOOKING_FIELDS.dump(existing, list(BOOKING_FIELDS.fields)))
+
+    form = BookingForm(data)
+    if not form.is_valid():
+        raise ApiError('Invalid booking.', errors=form.errors.get_json_data())
+    try:
+        booking, created = create_booking(form, request.user, idempotency_key)
+    except SlotUnavailable:
+        raise ApiError('This time slot is already booked. Please choose another time.', status=409)
+    return _private_response(BOOKING_FIELDS.dump(booking, list(BOOKING_FIELDS.fields)), status=201 if created else 200)
+
+
+@endpoint(methods=('POST',), login=True)
+def cancel_booking(request, booking_id):
+    with transaction.atomic():
+        booking = (
+            Booking.objects.select_for_update().select_related('service')
+            .filter(id=booking_id, user=request.user).first()
+        )
+        if booking is None:
+            raise ApiError('Booking not found.', status=404)
+        if booking.status != 'pending':
+            raise ApiError('This booking cannot be cancelled.', status=409)
+        booking.status = 'cancelled'
+        # save(), not update(): the post_save signal frees the slot in the availability cache
+        booking.save(update_fields=['status', 'updated_at'])
+    return _private_response(BOOKING_FIELDS.dump(booking, list(BOOKING_FIELDS.fields)))
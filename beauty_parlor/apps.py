@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class BeautyParlorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'beauty_parlor' 
\ No newline at end of file
+    name = 'beauty_parlor'
+
+    def ready(self):
+        from . import checks, signals, tasks  # noqa: F401
@@ -0,0 +1,166 @@
+"""
+Async versions of the read-heavy views, used when the site is served through
+roshni_beauty/asgi.py (see ASYNC_READ_VIEWS in settings).
+
+They return the same responses as their counterparts in views.py and share
+their query-building helpers. Queries go through the async ORM; independent
+lookups, such as the home page's services and testimonials, are awaited
+together. Each view loads the session user first. After that, templates that
+touch ``user`` or messages don't need the database while rendering on the
+event loop.
+"""
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.core.paginator import Paginator
+from django.http import Http404
+from django.shortcuts import render
+from . import catalog_cache
+from .conditional import conditional_on
+from .models import Service, Testimonial
+from .pagination import akeyset_page
+from .recommendations import arecommended_services
+from .search import search_services
+from .views import _my_bookings_query, _services_filters, _services_queryset
+
+
+async def _load_user(request):
+    """Resolve the lazy ``request.user`` off the event loop; later reads hit the cached object."""
+    await sync_to_async(lambda: request.user.is_authenticated)()
+    return request.user
+
+
+def login_required(view):
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await _load_user(request)
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+async def home(request):
+    async def home_services():
+        return [service async for service in Service.objects.filter(is_home_service=True)[:6]]
+
+    async def home_testimonials():
+        return [testimonial async for testimonial in Testimonial.objects.all()[:3]]
+
+    services, testimonials, _ = await asyncio.gather(
+        catalog_cache.afetch('home_services', [Service], home_services),
+        catalog_cache.afetch('home_testimonials', [Testimonial], home_testimonials),
+        _load_user(request),
+    )
+    context = {
+        'services': services,
+        'testimonials': testimonials,
+    }
+    return render(request, 'beauty_parlor/home.html', context)
+
+
+@conditional_on(Service)
+async def services(request):
+    filters = _services_filters(request)
+    category, search_query, sort, min_rating = filters
+
+    async def build():
+        if search_query:
+            # Ranking reads the full-text index through a raw cursor
+            queryset = await sync_to_async(_services_queryset)(*filters)
+        else:
+            queryset = _services_queryset(*filters)
+        return [service async for service in queryset]
+
+    services, catalog_version, _ = await asyncio.gather(
+        catalog_cache.afetch('services', [Service], build, *filters),
+        catalog_cache.aversions(Service),
+        _load_user(request),
+    )
+    page_obj = Paginator(services, 9).get_page(request.GET.get('page'))
+
+    context = {
+        'page_obj': page_obj,
+        'category': category,
+        'search_query': search_query,
+        'sort': sort,
+        'min_rating': min_rating,
+        'catalog_version': catalog_version,
+    }
+    return render(request, 'beauty_parlor/services.html', context)
+
+
+@conditional_on(Service)
+async def service_detail(request, service_id):
+    async def build():
+        service = await Service.objects.filter(id=service_id).afirst()
+        if service is None:
+            return None, []
+        related = Service.objects.filter(category=service.category).exclude(id=service_id)[:3]
+        return service, [related_service async for related_service in related]
+
+    (service, related_services), _ = await asyncio.gather(
+        catalog_cache.afetch('service_detail', [Service], build, service_id),
+        _load_user(request),
+    )
+    if service is None:
+        raise Http404('No Service matches the given query.')
+
+    context = {
+        'service': service,
+        'related_services': related_services,
+    }
+    return render(request, 'beauty_parlor/service_detail.html', context)
+
+
+@conditional_on(Testimonial)
+async def testimonials(request):
+    async def build():
+        return [testimonial async for testimonial in Testimonial.objects.all()]
+
+    testimonials, catalog_version, _ = await asyncio.gather(
+        catalog_cache.afetch('testimonials', [Testimonial], build),
+        catalog_cache.aversions(Testimonial),
+        _load_user(request),
+    )
+    context = {
+        'testimonials': testimonials,
+        'catalog_version': catalog_version,
+    }
+    return render(request, 'beauty_parlor/testimonials.html', context)
+
+
+@login_required
+async def my_bookings(request):
+    bookings, context = _my_bookings_query(request, request.user)
+    context['bookings'], context['next_cursor'] = await akeyset_page(bookings, request.GET.get('cursor'), page_size=20)
+    return render(request, 'beauty_parlor/my_bookings.html', context)
+
+
+async def ai_recommendations(request):
+    category = request.GET.get("category", "")
+    search_query = request.GET.get("search", "")
+    service_id = request.GET.get("service", "")
+
+    user = await _load_user(request)
+    source_service = None
+    if service_id.isdigit():
+        source_service = await Service.objects.filter(id=service_id).afirst()
+    recommended = await arecommended_services(user=user, service=source_service)
+    if source_service is None and not await recommended.aexists():
+        recommended = Service.objects.all()
+
+    if category:
+        recommended = recommended.filter(category__icontains=category)
+    if search_query:
+        recommended = await sync_to_async(search_services)(recommended, search_query)
+
+    context = {
+        "recommended": [service async for service in recommended[:9]],
+        "category": category,
+        "search_query": search_query,
+        "source_service": source_service,
+    }
+    return render(request, "beauty_parlor/recommendations.html", context)
@@ -0,0 +1,58 @@
+"""
+Short-lived cache of the logged-in user and their profile.
+
+AuthenticationMiddleware loads ``request.user`` through the configured
+backend on every request. CachedModelBackend serves it from the cache
+instead; the session hash check still runs against the cached password hash.
+The profile page reads the UserProfile through ``get_profile()``. signals.py
+drops both entries when the user or profile is saved or deleted, which covers
+password changes and logins. Logout also drops them.
+
+Invalidation only works if every worker process reads the same cache, so
+entries live in AUTH_USER_CACHE (a file cache by default). Check
+beauty_parlor.W002 warns when it is per-process.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from .models import UserProfile
+
+CACHE_ALIAS = getattr(settings, 'AUTH_USER_CACHE', 'default')
+TIMEOUT = getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 60 * 5)
+
+
+def _user_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def _profile_key(user_id):
+    return f'auth:profile:{user_id}'
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        cache = caches[CACHE_ALIAS]
+        user = cache.get(_user_key(user_id))
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(_user_key(user_id), user, TIMEOUT)
+            return user
+        return user if self.user_can_authenticate(user) else None
+
+
+def get_profile(user):
+    cache = caches[CACHE_ALIAS]
+    profile = cache.get(_profile_key(user.pk))
+    if profile is None:
+        profile, _ = UserProfile.objects.get_or_create(user=user)
+        cache.set(_profile_key(user.pk), profile, TIMEOUT)
+    return profile
+
+
+def invalidate_user(user_id):
+    caches[CACHE_ALIAS].delete_many([_user_key(user_id), _profile_key(user_id)])
+
+
+def invalidate_profile(user_id):
+    caches[CACHE_ALIAS].delete(_profile_key(user_id))
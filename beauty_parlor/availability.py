@@ -0,0 +1,146 @@
+"""
+Time-slot availability for services.
+
+Each service can run ``BOOKING_CAPACITY_PER_SERVICE`` appointments at once.
+A day's bookings for a service are loaded with one indexed query, turned into
+an interval index (a step function of concurrent appointments plus a sparse
+table for range-max lookups) and cached until a booking for that day changes.
+Any "how busy is [start, end)" question is then O(log n).
+
+A booking must also start in the future and finish by closing time on the
+same day; ``is_available`` applies the same window ``free_slots`` offers.
+"""
+import datetime
+from bisect import bisect_left, bisect_right
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Booking
+
+OPENING_TIME = getattr(settings, 'BOOKING_OPENING_TIME', datetime.time(9, 0))
+CLOSING_TIME = getattr(settings, 'BOOKING_CLOSING_TIME', datetime.time(20, 0))
+SLOT_MINUTES = getattr(settings, 'BOOKING_SLOT_MINUTES', 30)
+CAPACITY = getattr(settings, 'BOOKING_CAPACITY_PER_SERVICE', 1)
+CACHE_TIMEOUT = 60 * 5
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def _as_time(minutes):
+    return datetime.time(minutes // 60, minutes % 60)
+
+
+class IntervalIndex:
+    """Concurrency of half-open [start, end) minute intervals, answering range peaks in O(log n)."""
+
+    def __init__(self, intervals):
+        changes = {}
+        for start, end in intervals:
+            changes[start] = changes.get(start, 0) + 1
+            changes[end] = changes.get(end, 0) - 1
+        self.points = sorted(changes)
+
+        # levels[k] is the number of appointments running during [points[k], points[k + 1])
+        self.levels = []
+        running = 0
+        for point in self.points:
+            running += changes[point]
+            self.levels.append(running)
+
+        self.table = [self.levels]
+        width = 1
+        while width * 2 <= len(self.levels):
+            previous = self.table[-1]
+            self.table.append([max(previous[i], previous[i + width]) for i in range(len(previous) - width)])
+            width *= 2
+
+    def peak(self, start, end):
+        """Most appointments running at any moment in [start, end)."""
+        first = bisect_right(self.points, start) - 1
+        last = bisect_left(self.points, end) - 1
+        if last < 0:
+            return 0
+        first = max(first, 0)
+        row = (last - first + 1).bit_length() - 1
+        level = self.table[row]
+        return max(level[first], level[last - (1 << row) + 1])
+
+
+def _cache_key(service, day):
+    # Duration is part of the key so editing a service's length can't reuse stale intervals
+    return f'availability:{service.pk}:{service.duration}:{day.isoformat()}'
+
+
+def day_index(service, day, fresh=False):
+    """
+    Interval index of ``service``'s bookings on ``day``. ``fresh`` skips the
+    cache, for callers that must see rows committed a moment ago.
+    """
+    intervals = None if fresh else cache.get(_cache_key(service, day))
+    if intervals is None:
+        times = (
+            Booking.objects.filter(service=service, date=day)
+            .exclude(status='cancelled')
+            .values_list('time', flat=True)
+        )
+        intervals = [(_minutes(t), _minutes(t) + service.duration) for t in times]
+        cache.set(_cache_key(service, day), intervals, CACHE_TIMEOUT)
+    return IntervalIndex(intervals)
+
+
+def invalidate(service, day):
+    cache.delete(_cache_key(service, day))
+
+
+def _window(service, day):
+    """(first, last) start minute bookable for ``service`` on ``day``, or None once the day is over."""
+    first = _minutes(OPENING_TIME)
+    last = min(_minutes(CLOSING_TIME), 24 * 60) - service.duration
+
+    now = timezone.localtime()
+    if day < now.date():
+        return None
+    if day == now.date():
+        first = max(first, -(-_minutes(now.time()) // SLOT_MINUTES) * SLOT_MINUTES)
+    return first, last
+
+
+def unbookable_reason(service, day, time):
+    """Why ``service`` can't start at ``time`` on ``day`` whatever else is booked, or None."""
+    window = _window(service, day)
+    start = _minutes(time)
+    if window is None or _minutes(OPENING_TIME) <= start < window[0]:
+        return 'Please choose a time that has not passed yet.'
+    if not window[0] <= start <= window[1]:
+        return (
+            f'Please choose a start time between {OPENING_TIME:%H:%M} and {_as_time(max(window[1], 0)):%H:%M}, '
+            f'so the {service.duration}-minute service ends by {CLOSING_TIME:%H:%M}.'
+        )
+    return None
+
+
+def is_available(service, day, time, fresh=False):
+    if unbookable_reason(service, day, time):
+        return False
+    start = _minutes(time)
+    return day_index(service, day, fresh).peak(start, start + service.duration) < CAPACITY
+
+
+def free_slots(service, day):
+    """Return [(time, remaining_capacity)] for every bookable slot of ``service`` on ``day``."""
+    window = _window(service, day)
+    if window is None:
+        return []
+    first, last = window
+    index = day_index(service, day)
+
+    slots = []
+    for start in range(first, last + 1, SLOT_MINUTES):
+        remaining = CAPACITY - index.peak(start, start + service.duration)
+        if remaining > 0:
+            slots.append((_as_time(start), remaining))
+    return slots
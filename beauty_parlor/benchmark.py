@@ -0,0 +1,277 @@
+"""
+In-process request benchmarking.
+
+Requests go through django.test.Client, i.e. the full middleware stack, URL
+routing, views and templates, without a network hop. Latencies are measured
+per request; throughput is total requests over wall time across the worker
+threads. Query counts come from one extra, separately captured request (the
+second one on a fresh client) so the capture itself doesn't skew the timings.
+
+run_wsgi() and run_asgi() instead call the WSGI and ASGI handlers directly to
+compare the two deployment modes at high concurrency.
+
+run_templates() splits each request's time into template work (loading plus
+rendering, measured by TemplateTimer) and everything else.
+"""
+import asyncio
+import math
+import threading
+import time
+from collections import Counter
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.template.backends.django import DjangoTemplates, Template
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class Route:
+    """
+    One benchmarked route. ``request(client, i)`` issues the i-th request and
+    returns the response; ``client_factory()`` builds a client for a worker.
+    """
+
+    def __init__(self, name, request, client_factory=Client):
+        self.name = name
+        self.request = request
+        self.client_factory = client_factory
+
+
+def _worker(route, indices, result):
+    client = route.client_factory()
+    try:
+        for i in indices:
+            started = time.perf_counter()
+            response = route.request(client, i)
+            result['latencies'].append((time.perf_counter() - started) * 1000)
+            result['statuses'][response.status_code] += 1
+    except Exception as error:
+        result['errors'].append(repr(error))
+    finally:
+        connection.close()
+
+
+def run_route(route, requests=200, concurrency=1, warmup=10):
+    """Benchmark ``route``; request indices 0..requests-1 are timed, later ones are warmup/capture."""
+    for i in range(warmup):
+        route.request(route.client_factory(), requests + 1 + i)
+
+    results = [{'latencies': [], 'statuses': Counter(), 'errors': []} for _ in range(concurrency)]
+    threads = [
+        threading.Thread(target=_worker, args=(route, range(worker, requests, concurrency), results[worker]))
+        for worker in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    # Count queries on a client's second request, once login-time cache invalidation has settled
+    client = route.client_factory()
+    route.request(client, requests + 1 + warmup)
+    with CaptureQueriesContext(connection) as queries:
+        route.request(client, requests)
+
+    return {**_summarize(results, elapsed, concurrency), 'queries': len(queries)}
+
+
+def _summarize(results, elapsed, concurrency):
+    latencies = [latency for result in results for latency in result['latencies']]
+    statuses = sum((result['statuses'] for result in results), Counter())
+    errors = [error for result in results for error in result['errors']]
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'concurrency': concurrency,
+        'statuses': {str(code): count for code, count in sorted(statuses.items())},
+        'errors': errors,
+        'mean_ms': round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def _new_result():
+    return {'latencies': [], 'statuses': Counter(), 'errors': []}
+
+
+def run_wsgi(path, requests=500, concurrency=64, cookie=''):
+    """
+    Drive Django's WSGI handler directly from ``concurrency`` threads, like a
+    threaded WSGI server without the socket layer.
+    """
+    handler = WSGIHandler()
+    factory = RequestFactory()
+
+    def worker(count, result):
+        try:
+            for _ in range(count):
+                environ = factory.get(path, HTTP_COOKIE=cookie).environ
+                status = []
+                started = time.perf_counter()
+                body = handler(environ, lambda code, headers, exc_info=None: status.append(code))
+                b''.join(body)
+                body.close()
+                result['latencies'].append((time.perf_counter() - started) * 1000)
+                result['statuses'][int(status[0].split()[0])] += 1
+        except Exception as error:
+            result['errors'].append(repr(error))
+        finally:
+            connection.close()
+
+    results = [_new_result() for _ in range(concurrency)]
+    counts = [len(range(worker, requests, concurrency)) for worker in range(concurrency)]
+    threads = [threading.Thread(target=worker, args=(counts[i], results[i])) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return _summarize(results, time.perf_counter() - started, concurrency)
+
+
+async def _asgi_request(handler, path, cookie):
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'testserver'), (b'cookie', cookie.encode())],
+        'client': ('127.0.0.1', 0),
+        'server': ('testserver', 80),
+    }
+    status = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    await handler(scope, receive, send)
+    return status[0]
+
+
+def run_asgi(path, requests=500, concurrency=64, cookie=''):
+    """
+    Drive Django's ASGI handler with ``concurrency`` tasks on one event loop,
+    like a single uvicorn worker without the socket layer.
+    """
+    handler = ASGIHandler()
+
+    async def worker(count, result):
+        try:
+            for _ in range(count):
+                started = time.perf_counter()
+                code = await _asgi_request(handler, path, cookie)
+                result['latencies'].append((time.perf_counter() - started) * 1000)
+                result['statuses'][code] += 1
+        except Exception as error:
+            result['errors'].append(repr(error))
+
+    async def main():
+        results = [_new_result() for _ in range(concurrency)]
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            worker(len(range(i, requests, concurrency)), results[i]) for i in range(concurrency)
+        ])
+        return _summarize(results, time.perf_counter() - started, concurrency)
+
+    return asyncio.run(main())
+
+
+class TemplateTimer:
+    """
+    Time spent in template loading and rendering while active. Only outermost
+    calls count, so includes and templates rendered by template tags aren't
+    counted twice. Not thread-safe: use it with one client at a time.
+    """
+
+    def __init__(self):
+        self.elapsed = 0.0
+        self._depth = 0
+        self._originals = None
+
+    def _wrap(self, original):
+        def wrapper(*args, **kwargs):
+            self._depth += 1
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self._depth -= 1
+                if not self._depth:
+                    self.elapsed += time.perf_counter() - started
+        return wrapper
+
+    def __enter__(self):
+        self._originals = DjangoTemplates.get_template, Template.render
+        DjangoTemplates.get_template = self._wrap(DjangoTemplates.get_template)
+        Template.render = self._wrap(Template.render)
+        return self
+
+    def __exit__(self, *exc_info):
+        DjangoTemplates.get_template, Template.render = self._originals
+
+
+def run_templates(route, requests=100, warmup=10):
+    """Per-request template and total time of ``route``, one client, after ``warmup`` untimed requests."""
+    client = route.client_factory()
+    for i in range(warmup):
+        route.request(client, requests + i)
+
+    template_ms, total_ms, statuses = [], [], Counter()
+    with TemplateTimer() as timer:
+        for i in range(requests):
+            timer.elapsed = 0.0
+            started = time.perf_counter()
+            response = route.request(client, i)
+            total_ms.append((time.perf_counter() - started) * 1000)
+            template_ms.append(timer.elapsed * 1000)
+            statuses[response.status_code] += 1
+    template_ms.sort()
+    total_ms.sort()
+    return {
+        'requests': requests,
+        'statuses': {str(code): count for code, count in sorted(statuses.items())},
+        'template_mean_ms': round(sum(template_ms) / requests, 3),
+        'template_p50_ms': round(percentile(template_ms, 50), 3),
+        'template_p95_ms': round(percentile(template_ms, 95), 3),
+        'total_mean_ms': round(sum(total_ms) / requests, 3),
+        'total_p50_ms': round(percentile(total_ms, 50), 3),
+    }
+
+
+def compare(previous, current, threshold=0.2):
+    """Routes whose p95 latency grew by more than ``threshold`` or that run more queries."""
+    regressions = []
+    for name, result in current.items():
+        before = previous.get(name)
+        if not before:
+            continue
+        if before['p95_ms'] and result['p95_ms'] > before['p95_ms'] * (1 + threshold):
+            regressions.append(f"{name}: p95 {before['p95_ms']}ms -> {result['p95_ms']}ms")
+        if result['queries'] > before['queries']:
+            regressions.append(f"{name}: queries {before['queries']} -> {result['queries']}")
+    return regressions
@@ -0,0 +1,113 @@
+"""
+Atomic, idempotent booking creation.
+
+Competing requests for the same service are serialized by an UPDATE on the
+service row taken as the first statement of the transaction: it is a row lock
+on PostgreSQL/MySQL and grabs SQLite's write lock up front, so the
+availability check and the insert can't interleave with another writer.
+SQLite's "database is locked" errors are retried with bounded backoff.
+"""
+import random
+import time
+
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from . import availability, jobs, rollups
+from .models import Booking, Service
+
+MAX_ATTEMPTS = 5
+BACKOFF_SECONDS = 0.05
+
+# Target status -> the statuses a booking may move to it from in a bulk transition
+TRANSITIONS = {
+    'confirmed': ['pending'],
+    'completed': ['confirmed'],
+    'cancelled': ['pending', 'confirmed'],
+}
+
+
+class SlotUnavailable(Exception):
+    pass
+
+
+def _is_lock_error(error):
+    return 'database is locked' in str(error) or 'database table is locked' in str(error)
+
+
+def find_by_key(user, idempotency_key):
+    if not idempotency_key:
+        return None
+    return Booking.objects.filter(user=user, idempotency_key=idempotency_key).first()
+
+
+def _create(form, user, idempotency_key):
+    service = form.cleaned_data['service']
+    with transaction.atomic(durable=True):
+        Service.objects.filter(pk=service.pk).update(duration=F('duration'))
+
+        existing = find_by_key(user, idempotency_key)
+        if existing is not None:
+            return existing, False
+
+        service.refresh_from_db(fields=['duration', 'price'])
+        if not availability.is_available(service, form.cleaned_data['date'], form.cleaned_data['time'], fresh=True):
+            raise SlotUnavailable
+
+        # A fresh instance per attempt, so a rolled-back try can't leave a stale pk behind
+        booking = Booking(user=user, idempotency_key=idempotency_key or None, **{
+            field: form.cleaned_data[field] for field in form.Meta.fields
+        })
+        booking.save()
+        if user is not None and user.email:
+            jobs.enqueue('booking_confirmation', {'booking_id': booking.pk})
+        return booking, True
+
+
+def create_booking(form, user, idempotency_key=None):
+    """
+    Save a valid BookingForm for ``user``. Returns (booking, created); a repeat
+    of an earlier request with the same key returns the original booking.
+    Raises SlotUnavailable when the slot filled up.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            return _create(form, user, idempotency_key)
+        except IntegrityError:
+            # A twin request with the same key committed first
+            existing = find_by_key(user, idempotency_key)
+            if existing is None:
+                raise
+            return existing, False
+        except OperationalError as error:
+            if not _is_lock_error(error) or attempt == MAX_ATTEMPTS - 1:
+                raise
+            time.sleep(BACKOFF_SECONDS * 2 ** attempt * (1 + random.random()))
+
+
+def transition(queryset, status):
+    """
+    Move every booking in ``queryset`` that may reach ``status`` there with a
+    single UPDATE, instead of one save() per row. Returns how many moved.
+
+    UPDATE sends no signals, so the rollups are adjusted per (date, service,
+    status) group, and cancelled bookings' days are dropped from the
+    availability cache.
+    """
+    eligible = queryset.filter(status__in=TRANSITIONS[status]).order_by()
+    now = timezone.now()
+    with transaction.atomic():
+        # Lock the rows first (SQLite: the write lock), so the groups match what the UPDATE changes
+        if not eligible.update(updated_at=now):
+            return 0
+        groups = list(
+            eligible.values('date', 'service_id', 'status').annotate(count=Count('id'), revenue=Sum('total_amount'))
+        )
+        moved = eligible.update(status=status, updated_at=now)
+        rollups.bookings_moved(groups, status)
+    if status == 'cancelled':
+        services = Service.objects.in_bulk({group['service_id'] for group in groups})
+        for group in groups:
+            availability.invalidate(services[group['service_id']], group['date'])
+    return moved
@@ -0,0 +1,103 @@
+"""
+Versioned cache for the public catalog (services and testimonials).
+
+Every cached value is keyed on the current version of the models it was built
+from. Saving or deleting a Service/Testimonial bumps that model's version (see
+signals.py), so stale entries are never read again and simply expire.
+Hit/miss counters live in the cache too, so every worker sharing the backend
+reports into the same totals.
+"""
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+TIMEOUT = getattr(settings, 'CATALOG_CACHE_TIMEOUT', 60 * 15)
+TRACK_STATS = getattr(settings, 'CATALOG_CACHE_STATS', True)
+
+STATS_KEYS = {'hits': 'catalog:stats:hits', 'misses': 'catalog:stats:misses'}
+_MISSING = object()
+
+
+def _version_key(model):
+    return f'catalog:version:{model._meta.label_lower}'
+
+
+def versions(*models):
+    """Current version token covering ``models``, e.g. '17.4'."""
+    keys = [_version_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            # A nanosecond timestamp can't collide with versions issued before an eviction
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+    return '.'.join(str(found[key]) for key in keys)
+
+
+async def aversions(*models):
+    keys = [_version_key(model) for model in models]
+    found = await cache.aget_many(keys)
+    for key in keys:
+        if key not in found:
+            await cache.aadd(key, time.time_ns(), None)
+            found[key] = await cache.aget(key)
+    return '.'.join(str(found[key]) for key in keys)
+
+
+def bump(model):
+    try:
+        cache.incr(_version_key(model))
+    except ValueError:
+        cache.set(_version_key(model), time.time_ns(), None)
+
+
+def _count(name):
+    if not TRACK_STATS:
+        return
+    try:
+        cache.incr(STATS_KEYS[name])
+    except ValueError:
+        cache.add(STATS_KEYS[name], 1, None)
+
+
+def fetch(name, models, build, *parts):
+    """
+    Return the cached value for ``name``/``parts`` built from ``models``,
+    calling ``build()`` and storing its result on a miss.
+    """
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    key = f'catalog:{name}:{versions(*models)}:{digest}'
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        _count('misses')
+        value = build()
+        cache.set(key, value, TIMEOUT)
+    else:
+        _count('hits')
+    return value
+
+
+async def afetch(name, models, build, *parts):
+    """Async fetch(); ``build`` is a coroutine function."""
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    key = f'catalog:{name}:{await aversions(*models)}:{digest}'
+    value = await cache.aget(key, _MISSING)
+    if value is _MISSING:
+        await sync_to_async(_count)('misses')
+        value = await build()
+        await cache.aset(key, value, TIMEOUT)
+    else:
+        await sync_to_async(_count)('hits')
+    return value
+
+
+def stats():
+    found = cache.get_many(STATS_KEYS.values())
+    return {name: found.get(key, 0) for name, key in STATS_KEYS.items()}
+
+
+def reset_stats():
+    cache.delete_many(STATS_KEYS.values())
@@ -0,0 +1,50 @@
+"""
+System checks for settings that only misbehave once there are several
+worker processes.
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# Backends whose entries a worker process can't see from the others
+PER_PROCESS_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def _per_process(alias):
+    return settings.CACHES.get(alias, {}).get('BACKEND') in PER_PROCESS_CACHES
+
+
+@register(Tags.caches)
+def check_throttle_cache(app_configs, **kwargs):
+    alias = getattr(settings, 'THROTTLE_CACHE', 'default')
+    if getattr(settings, 'THROTTLE_RATES', {}) and _per_process(alias):
+        return [Warning(
+            f'THROTTLE_CACHE ({alias!r}) is not shared between worker processes.',
+            hint='Each worker keeps its own buckets, so the real limits are the rates times the number of workers. '
+                 'Point THROTTLE_CACHE at a file, Redis or Memcached cache.',
+            id='beauty_parlor.W001',
+        )]
+    return []
+
+
+@register(Tags.caches, Tags.security)
+def check_auth_caches(app_configs, **kwargs):
+    warnings = []
+    alias = getattr(settings, 'AUTH_USER_CACHE', 'default')
+    if 'beauty_parlor.auth_cache.CachedModelBackend' in settings.AUTHENTICATION_BACKENDS and _per_process(alias):
+        warnings.append(Warning(
+            f'AUTH_USER_CACHE ({alias!r}) is not shared between worker processes.',
+            hint='A password change, deactivation or revoked staff status only clears the cached user in one '
+                 'worker; the others keep it until AUTH_USER_CACHE_TIMEOUT. Use a file, Redis or Memcached cache.',
+            id='beauty_parlor.W002',
+        ))
+    cached_sessions = ('django.contrib.sessions.backends.cache', 'django.contrib.sessions.backends.cached_db')
+    if settings.SESSION_ENGINE in cached_sessions and _per_process(settings.SESSION_CACHE_ALIAS):
+        warnings.append(Warning(
+            f'SESSION_CACHE_ALIAS ({settings.SESSION_CACHE_ALIAS!r}) is not shared between worker processes.',
+            hint='A logout only ends the session in the worker that handled it. Use a file, Redis or Memcached cache.',
+            id='beauty_parlor.W003',
+        ))
+    return warnings
@@ -0,0 +1,97 @@
+"""
+Conditional GET for catalog pages.
+
+``@conditional_on(Model)`` answers a request with one aggregate query (the
+newest ``updated_at`` plus the row count, so deletions also count as changes)
+before the view runs. When the client's If-None-Match / If-Modified-Since
+still match, it returns 304 without touching the view's querysets or
+templates. Otherwise the view renders as usual and the response carries the
+ETag and Last-Modified headers.
+
+The ETag also covers the full path (filters, page) and the current user,
+since the navbar differs per login, and RELEASE_VERSION, so a deploy that
+changes templates invalidates old copies. Requests with pending flash messages
+always render, so the messages aren't held back by a 304.
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+RELEASE = getattr(settings, 'RELEASE_VERSION', '')
+
+
+def _validators(request, freshness, public):
+    last_modified = freshness['last']
+    user_key = '' if public or not request.user.is_authenticated else request.user.pk
+    stamp = last_modified.isoformat() if last_modified else ''
+    raw = f"{RELEASE}:{stamp}:{freshness['count']}:{user_key}:{request.get_full_path()}"
+    etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+    return etag, int(last_modified.timestamp()) if last_modified else None
+
+
+def _respond(request, freshness, public):
+    """(etag, last_modified, 304 response or None)."""
+    etag, last_modified = _validators(request, freshness, public)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    return etag, last_modified, response
+
+
+def _add_headers(request, response, etag, last_modified):
+    if request.method in ('GET', 'HEAD') and response.status_code == 200:
+        if last_modified and not response.has_header('Last-Modified'):
+            response.headers['Last-Modified'] = http_date(last_modified)
+        response.headers.setdefault('ETag', etag)
+    return response
+
+
+def _skip(request, public):
+    if request.method not in ('GET', 'HEAD'):
+        return True
+    return not public and len(messages.get_messages(request))
+
+
+def conditional_on(model, public=False, owner=None):
+    """
+    Serve 304s for a view whose output only depends on ``model`` rows (and the request).
+
+    ``public`` leaves the user out of the ETag and never reads the session, for
+    responses that are the same for everyone. ``owner`` names the field that
+    ties rows to the logged-in user, to only consider that user's rows.
+    """
+    freshness = {'last': Max('updated_at'), 'count': Count('id')}
+
+    def rows(request):
+        return model.objects.filter(**{owner: request.user}) if owner else model.objects.all()
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_inner(request, *args, **kwargs):
+                if await sync_to_async(_skip)(request, public):
+                    return await view(request, *args, **kwargs)
+                if not public:
+                    # Resolve the lazy user off the event loop
+                    await sync_to_async(lambda: request.user.is_authenticated)()
+                etag, last_modified, response = _respond(request, await rows(request).aaggregate(**freshness), public)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return _add_headers(request, response, etag, last_modified)
+            return async_inner
+
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            if _skip(request, public):
+                return view(request, *args, **kwargs)
+            etag, last_modified, response = _respond(request, rows(request).aggregate(**freshness), public)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return _add_headers(request, response, etag, last_modified)
+        return inner
+
+    return decorator
@@ -0,0 +1,14 @@
+"""
+Template context for every page.
+
+``release_version`` goes into the keys of cached template fragments, so a
+deploy that changes templates doesn't keep serving the old markup from a
+shared cache.
+"""
+from django.conf import settings
+
+RELEASE = getattr(settings, 'RELEASE_VERSION', '')
+
+
+def release(request):
+    return {'release_version': RELEASE}
@@ -0,0 +1,257 @@
+"""
+Dispatch planning for home-service bookings.
+
+``plan_day()`` turns one day's home visits into itineraries for the staff who
+travel to customers:
+
+1. Each booking's free-text address is matched to an Area from the gazetteer
+   (see load_gazetteer): by pincode first, then by the longest area name found
+   in the text. Addresses that match nothing are planned separately.
+2. Areas with bookings that day are clustered into zones: the busiest area
+   seeds a zone and takes every unclaimed area within
+   DISPATCH_CLUSTER_RADIUS_KM of it.
+3. Within a zone, visits are taken in booked-time order and each one joins the
+   itinerary that is free in time (previous visit's ``Service.duration`` plus
+   travel) and nearest to it; if none is, a new itinerary starts. Booked times
+   are fixed, so the heuristic only chooses who goes where; the number of
+   itineraries is the number of travelling staff the day needs.
+
+Travel time is straight-line distance times a road factor at
+DISPATCH_TRAVEL_SPEED_KMH, from a small area-to-area table, so planning stays
+linear in bookings times itineraries per zone. A day's plan replaces the
+previous one in a single transaction.
+"""
+import datetime
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Area, Booking, Itinerary, ItineraryStop
+
+TRAVEL_SPEED_KMH = getattr(settings, 'DISPATCH_TRAVEL_SPEED_KMH', 18)
+BUFFER_MINUTES = getattr(settings, 'DISPATCH_BUFFER_MINUTES', 10)
+CLUSTER_RADIUS_KM = getattr(settings, 'DISPATCH_CLUSTER_RADIUS_KM', 5)
+UNRESOLVED_TRAVEL_MINUTES = getattr(settings, 'DISPATCH_UNRESOLVED_TRAVEL_MINUTES', 45)
+ROAD_FACTOR = 1.4  # road distance over straight-line distance in the city
+PLANNED_STATUSES = ('pending', 'confirmed')
+UNRESOLVED_ZONE = 'Unresolved addresses'
+
+_PINCODE = re.compile(r'(?<!\d)(\d{3})\s?(\d{3})(?!\d)')
+_SIDES = {'e': 'east', 'w': 'west'}
+_BRACKETED_SIDE = re.compile(r'\(\s*([ew])\s*\)')
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def _normalize(text):
+    text = _BRACKETED_SIDE.sub(lambda match: f' {_SIDES[match.group(1)]} ', text.lower())
+    return f" {_NON_WORD.sub(' ', text).strip()} "
+
+
+class Gazetteer:
+    """Resolves addresses to Areas; build one per planning run."""
+
+    def __init__(self, areas):
+        self.areas = {area.id: area for area in areas}
+        self.by_pincode = defaultdict(list)
+        for area in self.areas.values():
+            self.by_pincode[area.pincode].append(area)
+        # Longest names first, so "Andheri West" wins over a shorter name it contains
+        self.names = sorted(((_normalize(area.name), area) for area in self.areas.values()), key=lambda item: -len(item[0]))
+        # A bare "E"/"W" is a side only right after a name that has sides ("Andheri W"),
+        # not elsewhere in the address ("Flat E 12", "Wing W")
+        sided = {
+            name.strip().rsplit(' ', 1)[0] for name, _ in self.names
+            if name.endswith((' east ', ' west ')) and name.strip().count(' ')
+        }
+        self._bare_side = re.compile(
+            r' (%s) ([ew])(?= )' % '|'.join(re.escape(name) for name in sorted(sided, key=len, reverse=True))
+        ) if sided else None
+        self._resolved = {}
+
+    @classmethod
+    def load(cls):
+        return cls(Area.objects.all())
+
+    def resolve(self, address):
+        """The Area an address is in, or None."""
+        if address not in self._resolved:
+            self._resolved[address] = self._match(address or '')
+        return self._resolved[address]
+
+    def _match(self, address):
+        text = _normalize(address)
+        if self._bare_side:
+            text = self._bare_side.sub(lambda match: f' {match.group(1)} {_SIDES[match.group(2)]}', text)
+        for first, last in _PINCODE.findall(address):
+            candidates = self.by_pincode.get(first + last)
+            if candidates:
+                return next((area for area in candidates if _normalize(area.name) in text), candidates[0])
+        return next((area for name, area in self.names if name in text), None)
+
+
+def distance_km(a, b):
+    """Great-circle distance between two Areas."""
+    lat1, lat2 = math.radians(a.latitude), math.radians(b.latitude)
+    dlat, dlon = lat2 - lat1, math.radians(b.longitude - a.longitude)
+    h = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    return 2 * 6371 * math.asin(math.sqrt(h))
+
+
+class TravelTimes:
+    """Minutes between areas, computed once per pair."""
+
+    def __init__(self):
+        self._minutes = {}
+
+    def __call__(self, a, b):
+        if a is None or b is None:
+            return UNRESOLVED_TRAVEL_MINUTES
+        if a.id == b.id:
+            return BUFFER_MINUTES
+        key = (a.id, b.id) if a.id < b.id else (b.id, a.id)
+        if key not in self._minutes:
+            km = distance_km(a, b) * ROAD_FACTOR
+            self._minutes[key] = BUFFER_MINUTES + math.ceil(km / TRAVEL_SPEED_KMH * 60)
+        return self._minutes[key]
+
+
+@dataclass
+class Visit:
+    booking_id: int
+    area: Area
+    start: int  # minutes after midnight
+    duration: int
+
+    @property
+    def end(self):
+        return self.start + self.duration
+
+
+@dataclass
+class Route:
+    zone: str
+    stops: list = field(default_factory=list)  # (visit, travel minutes from the previous stop)
+
+    @property
+    def last(self):
+        return self.stops[-1][0]
+
+
+def cluster(visits):
+    """Group resolved visits into zones: {zone name: [visit]}."""
+    by_area = defaultdict(list)
+    for visit in visits:
+        by_area[visit.area.id].append(visit)
+    areas = {visit.area.id: visit.area for visit in visits}
+    busiest_first = sorted(by_area, key=lambda area_id: (-len(by_area[area_id]), areas[area_id].name))
+
+    zones = {}
+    claimed = set()
+    for seed_id in busiest_first:
+        if seed_id in claimed:
+            continue
+        seed = areas[seed_id]
+        members = [
+            area_id for area_id in busiest_first
+            if area_id not in claimed and (area_id == seed_id or distance_km(seed, areas[area_id]) <= CLUSTER_RADIUS_KM)
+        ]
+        claimed.update(members)
+        zones[seed.name] = [visit for area_id in members for visit in by_area[area_id]]
+    return zones
+
+
+def route(zone, visits, travel):
+    """Assign a zone's visits to routes, each visit to the nearest route free in time."""
+    routes = []
+    for visit in sorted(visits, key=lambda visit: (visit.start, -visit.duration, visit.booking_id)):
+        best, best_key = None, None
+        for candidate in routes:
+            minutes = travel(candidate.last.area, visit.area)
+            idle = visit.start - candidate.last.end - minutes
+            if idle < 0:
+                continue
+            key = (minutes, idle)
+            if best_key is None or key < best_key:
+                best, best_key = candidate, key
+        if best is None:
+            routes.append(Route(zone, [(visit, 0)]))
+        else:
+            best.stops.append((visit, best_key[0]))
+    return routes
+
+
+def _time(minutes):
+    minutes = min(minutes, 24 * 60 - 1)
+    return datetime.time(minutes // 60, minutes % 60)
+
+
+def day_visits(day):
+    """The day's plannable home visits, as (Visit, address) pairs, in one query."""
+    rows = (
+        Booking.objects.filter(date=day, is_home_service=True, status__in=PLANNED_STATUSES)
+        .values_list('id', 'address', 'time', 'service__duration')
+        .order_by('time', 'id')
+    )
+    return [
+        (Visit(booking_id, None, moment.hour * 60 + moment.minute, duration or 60), address)
+        for booking_id, address, moment, duration in rows
+    ]
+
+
+def plan(visits, gazetteer):
+    """Resolve, cluster and route ``visits``; returns the routes, busiest zones first."""
+    travel = TravelTimes()
+    resolved, unresolved = [], []
+    for visit, address in visits:
+        visit.area = gazetteer.resolve(address)
+        (resolved if visit.area else unresolved).append(visit)
+
+    routes = []
+    for zone, members in cluster(resolved).items():
+        routes.extend(route(zone, members, travel))
+    if unresolved:
+        routes.extend(route(UNRESOLVED_ZONE, unresolved, travel))
+    return routes
+
+
+def plan_day(day, gazetteer=None):
+    """Plan ``day`` and store its itineraries, replacing any earlier plan. Returns the routes."""
+    gazetteer = gazetteer or Gazetteer.load()
+    routes = plan(day_visits(day), gazetteer)
+
+    with transaction.atomic():
+        Itinerary.objects.filter(date=day).delete()
+        itineraries = Itinerary.objects.bulk_create([
+            Itinerary(
+                date=day,
+                zone=route.zone,
+                number=number,
+                start_time=_time(route.stops[0][0].start),
+                end_time=_time(route.last.end),
+                visits=len(route.stops),
+                service_minutes=sum(visit.duration for visit, _ in route.stops),
+                travel_minutes=sum(minutes for _, minutes in route.stops),
+            )
+            for number, route in enumerate(routes, start=1)
+        ])
+        ItineraryStop.objects.bulk_create(
+            [
+                ItineraryStop(
+                    itinerary=itinerary,
+                    booking_id=visit.booking_id,
+                    area=visit.area,
+                    position=position,
+                    travel_minutes=minutes,
+                    start_time=_time(visit.start),
+                    end_time=_time(visit.end),
+                )
+                for itinerary, route in zip(itineraries, routes)
+                for position, (visit, minutes) in enumerate(route.stops, start=1)
+            ],
+            batch_size=1000,
+        )
+    return routes
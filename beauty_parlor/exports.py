@@ -0,0 +1,109 @@
+"""
+Streaming CSV / NDJSON exports of bookings and contacts.
+
+Rows are read with ``values_list(...).iterator()``: the user and service
+columns come from the same JOIN, no model instances are built, and the
+database cursor is consumed in chunks. Each row is encoded and handed on
+(to a StreamingHttpResponse or a file) before the next chunk is fetched, so
+memory stays flat however many rows the queryset matches.
+
+CSV text cells that a spreadsheet would run as a formula (starting with =,
++, -, @, tab or CR) are prefixed with a quote. NDJSON is left as stored.
+"""
+import csv
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+CHUNK_SIZE = 2000
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# (column header, lookup)
+BOOKING_COLUMNS = [
+    ('id', 'id'),
+    ('created_at', 'created_at'),
+    ('status', 'status'),
+    ('date', 'date'),
+    ('time', 'time'),
+    ('is_home_service', 'is_home_service'),
+    ('total_amount', 'total_amount'),
+    ('address', 'address'),
+    ('special_requests', 'special_requests'),
+    ('user_id', 'user_id'),
+    ('username', 'user__username'),
+    ('user_email', 'user__email'),
+    ('user_name', 'user__first_name'),
+    ('user_last_name', 'user__last_name'),
+    ('service_id', 'service_id'),
+    ('service', 'service__name'),
+    ('service_category', 'service__category'),
+    ('service_price', 'service__price'),
+]
+
+CONTACT_COLUMNS = [
+    ('id', 'id'),
+    ('created_at', 'created_at'),
+    ('name', 'name'),
+    ('email', 'email'),
+    ('phone', 'phone'),
+    ('subject', 'subject'),
+    ('message', 'message'),
+]
+
+FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+}
+
+
+def rows(queryset, columns):
+    """Yield one tuple per row, with the related columns joined in."""
+    return queryset.values_list(*(lookup for _, lookup in columns)).iterator(chunk_size=CHUNK_SIZE)
+
+
+class _Echo:
+    """A file-like object whose write() returns the line, so csv.writer can produce strings."""
+
+    def write(self, value):
+        return value
+
+
+def _local(value):
+    if isinstance(value, datetime.datetime):
+        return timezone.localtime(value).isoformat() if timezone.is_aware(value) else value.isoformat()
+    return value
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return _local(value)
+
+
+def csv_lines(queryset, columns):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([header for header, _ in columns])
+    for row in rows(queryset, columns):
+        yield writer.writerow([_csv_cell(value) for value in row])
+
+
+def ndjson_lines(queryset, columns):
+    headers = [header for header, _ in columns]
+    encoder = DjangoJSONEncoder()
+    for row in rows(queryset, columns):
+        yield encoder.encode({header: _local(value) for header, value in zip(headers, row)}) + '\n'
+
+
+def lines(queryset, columns, fmt):
+    return csv_lines(queryset, columns) if fmt == 'csv' else ndjson_lines(queryset, columns)
+
+
+def streaming_response(queryset, columns, fmt, name):
+    content_type, extension = FORMATS[fmt]
+    filename = f"{name}-{timezone.localdate():%Y%m%d}.{extension}"
+    response = StreamingHttpResponse(lines(queryset, columns, fmt), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -1,6 +1,8 @@
 from django import forms
-from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.forms import PasswordResetForm, UserCreationForm
 from django.contrib.auth.models import User
+from django.utils import timezone
+from . import availability, jobs
 from .models import Contact, Booking, Service, UserProfile, Review
 
 class UserRegistrationForm(UserCreationForm):
@@ -57,6 +59,15 @@ class BookingForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         # Only show home services
         self.fields['service'].queryset = Service.objects.filter(is_home_service=True)
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        service, date, time = (cleaned_data.get(field) for field in ('service', 'date', 'time'))
+        if service and date and time:
+            reason = availability.unbookable_reason(service, date, time)
+            if reason:
+                self.add_error('date' if date < timezone.localdate() else 'time', reason)
+        return cleaned_data
 
 class ReviewForm(forms.ModelForm):
     class Meta:
@@ -66,4 +77,22 @@ class ReviewForm(forms.ModelForm):
             'rating': forms.Select(choices=[(i, f'{i} Star{"s" if i != 1 else ""}') for i in range(1, 6)], 
             attrs={'class': 'form-control'}),
             'comment': forms.Textarea(attrs={'class': 'form-control', 'placeholder': 'Share your experience', 'rows': 4}),
-        } 
\ No newline at end of file
+        } 
+
+class QueuedPasswordResetForm(PasswordResetForm):
+    """
+    Leaves rendering and sending the reset email to the job worker. Only the
+    user id and the site details are queued; the worker makes the token, so
+    no live reset link is ever stored in the Job table.
+    """
+    
+    def send_mail(self, subject_template_name, email_template_name, context, from_email, to_email, html_email_template_name=None):
+        jobs.enqueue('password_reset_email', {
+            'user_id': context['user'].pk,
+            'context': {key: context[key] for key in ('email', 'domain', 'site_name', 'protocol')},
+            'subject_template': subject_template_name,
+            'email_template': email_template_name,
+            'html_email_template': html_email_template_name,
+            'from_email': from_email,
+            'to': [to_email],
+        })
@@ -0,0 +1,150 @@
+"""
+Responsive variants for uploaded images.
+
+For an original ``services/Bridle.png`` we store, next to it, a resized copy in
+the original format and a WebP copy for each configured width, e.g.
+``services/Bridle-320w.png`` and ``services/Bridle-320w.webp``. Widths at or
+above the original's width are skipped; images are never upscaled. A WebP
+copy at the original's own width (``services/Bridle-640w.webp`` for a 640px
+original) tops the WebP srcset, and the original itself tops the other one,
+so large and high-DPR screens still get full resolution.
+
+Templates ask ``variants()``, which caches what it finds on disk.
+Generating variants only drops that entry: the backfill command writes from
+worker processes, and with a per-process (locmem) cache anything they stored
+would never reach the web process. An empty result is cached only for
+VARIANTS_MISS_TIMEOUT, so variants written elsewhere show up soon after.
+"""
+import hashlib
+import io
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+WIDTHS = getattr(settings, 'IMAGE_VARIANT_WIDTHS', (160, 320, 640, 960))
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+VARIANTS_TIMEOUT = 60 * 60
+VARIANTS_MISS_TIMEOUT = 60
+
+_FORMATS = {'.jpg': 'JPEG', '.jpeg': 'JPEG', '.png': 'PNG', '.webp': 'WEBP'}
+
+
+def variant_name(name, width, extension=None):
+    root, original_extension = os.path.splitext(name)
+    return f'{root}-{width}w{extension or original_extension.lower()}'
+
+
+def _encode(image, image_format):
+    buffer = io.BytesIO()
+    if image_format == 'JPEG':
+        image.convert('RGB').save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    elif image_format == 'WEBP':
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+    else:
+        image.save(buffer, image_format, optimize=True)
+    return buffer.getvalue()
+
+
+def _replace(storage, name, content):
+    if storage.exists(name):
+        storage.delete(name)
+    storage.save(name, ContentFile(content))
+
+
+def _oriented_size(image):
+    """Size after EXIF rotation, read from the header without decoding the pixels."""
+    width, height = image.size
+    if image.getexif().get(0x0112) in (5, 6, 7, 8):
+        return height, width
+    return width, height
+
+
+def _is_fresh(storage, name, source_time):
+    return storage.exists(name) and storage.get_modified_time(name) >= source_time
+
+
+def generate_variants(storage, name):
+    """
+    Write the variants of ``name`` that are missing or older than it; up to
+    date ones are left alone. Returns the widths available.
+    """
+    image_format = _FORMATS.get(os.path.splitext(name)[1].lower())
+    if image_format is None or not storage.exists(name):
+        return []
+
+    source_time = storage.get_modified_time(name)
+    with storage.open(name, 'rb') as original:
+        image = Image.open(original)
+        full_width, full_height = _oriented_size(image)
+        # (width, extension) -> target; the full-width WebP is only worth having for non-WebP originals
+        targets = {(width, extension) for width in WIDTHS if width < full_width for extension in (None, '.webp')}
+        if image_format != 'WEBP':
+            targets.add((full_width, '.webp'))
+        stale = {target for target in targets if not _is_fresh(storage, variant_name(name, *target), source_time)}
+        if stale:
+            image = ImageOps.exif_transpose(image)
+            image.load()
+
+    if stale:
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if image.mode in ('LA', 'PA') or 'transparency' in image.info else 'RGB')
+        for width in sorted({width for width, _ in stale}):
+            resized = image if width == full_width else image.resize(
+                (width, round(full_height * width / full_width)), Image.LANCZOS
+            )
+            for extension, encoding in ((None, image_format), ('.webp', 'WEBP')):
+                if (width, extension) in stale:
+                    _replace(storage, variant_name(name, width, extension), _encode(resized, encoding))
+        cache.delete(_variants_key(name))
+    return sorted({width for width, _ in targets})
+
+
+def _variants_key(name):
+    return f'image_files:{hashlib.md5(name.encode()).hexdigest()}'
+
+
+def variants(storage, name):
+    """
+    What is on disk for ``name``: ``width`` (the original's), ``widths`` (the
+    resized copies) and ``webp`` (a full-width WebP copy exists, or the
+    original is WebP). Cached so templates don't stat files per request.
+    """
+    found = cache.get(_variants_key(name))
+    if found is None:
+        found = {'width': None, 'widths': [], 'webp': False}
+        try:
+            with storage.open(name, 'rb') as original:
+                found['width'] = _oriented_size(Image.open(original))[0]
+        except (OSError, ValueError):
+            pass
+        if found['width']:
+            found['widths'] = [
+                width for width in WIDTHS
+                if width < found['width'] and storage.exists(variant_name(name, width, '.webp'))
+            ]
+            found['webp'] = name.lower().endswith('.webp') or storage.exists(variant_name(name, found['width'], '.webp'))
+        present = found['widths'] or found['webp']
+        cache.set(_variants_key(name), found, VARIANTS_TIMEOUT if present else VARIANTS_MISS_TIMEOUT)
+    return found
+
+
+def has_variants(fieldfile):
+    found = variants(fieldfile.storage, fieldfile.name)
+    return bool(found['widths'] or found['webp'])
+
+
+def srcset(fieldfile, extension=None):
+    """Resized copies plus a full-width candidate: the WebP copy for ``.webp``, otherwise the original."""
+    storage, name = fieldfile.storage, fieldfile.name
+    found = variants(storage, name)
+    candidates = [(storage.url(variant_name(name, width, extension)), width) for width in found['widths']]
+    if extension == '.webp' and not name.lower().endswith('.webp'):
+        if found['webp']:
+            candidates.append((storage.url(variant_name(name, found['width'], '.webp')), found['width']))
+    elif found['width']:
+        candidates.append((fieldfile.url, found['width']))
+    return ', '.join(f'{url} {width}w' for url, width in candidates)
@@ -0,0 +1,168 @@
+"""
+Database-backed background jobs.
+
+Views call ``enqueue()`` instead of doing slow work (mostly sending mail) in
+the request. Jobs are rows in the Job table, so they are written in the same
+transaction as the booking or contact message they belong to, and no broker
+is needed. The ``run_jobs`` command claims due jobs in batches and runs them.
+
+* Failed jobs are retried with exponential backoff until ``max_attempts``,
+  then left as ``failed`` with the last error.
+* Mail tasks return an EmailMessage instead of sending it; the worker sends a
+  whole batch over one backend connection.
+* A job still ``running`` after JOB_LOCK_TIMEOUT belongs to a worker that died;
+  ``requeue_stuck()`` puts it back in the queue.
+"""
+import datetime
+import random
+import traceback
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Job
+
+BATCH_SIZE = getattr(settings, 'JOB_BATCH_SIZE', 50)
+LOCK_TIMEOUT = getattr(settings, 'JOB_LOCK_TIMEOUT', 300)
+RETRY_BASE_SECONDS = getattr(settings, 'JOB_RETRY_BASE_SECONDS', 30)
+RETRY_MAX_SECONDS = 60 * 60 * 6
+
+_tasks = {}
+
+
+class Task:
+    def __init__(self, name, func, mail=False):
+        self.name = name
+        self.func = func
+        self.mail = mail
+
+
+def task(name, mail=False):
+    """Register ``func(payload)`` as a job. Mail tasks return an EmailMessage, or None to skip."""
+    def register(func):
+        _tasks[name] = Task(name, func, mail)
+        return func
+    return register
+
+
+def enqueue(name, payload=None, delay=0, max_attempts=5):
+    if name not in _tasks:
+        raise ValueError(f'Unknown job {name!r}')
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        run_at=timezone.now() + datetime.timedelta(seconds=delay),
+        max_attempts=max_attempts,
+    )
+
+
+def backoff(attempts):
+    """Seconds to wait before retry number ``attempts``, with jitter so failures don't retry in lockstep."""
+    return min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS) * random.uniform(0.8, 1.2)
+
+
+def claim(worker, limit=BATCH_SIZE):
+    """Lock up to ``limit`` due jobs for ``worker`` and return them."""
+    now = timezone.now()
+    with transaction.atomic():
+        # skip_locked lets several workers share the queue on PostgreSQL; SQLite serializes writers anyway
+        ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status='queued', run_at__lte=now)
+            .order_by('run_at', 'id')
+            .values_list('id', flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        Job.objects.filter(id__in=ids, status='queued').update(status='running', locked_at=now, locked_by=worker)
+    return list(Job.objects.filter(id__in=ids, status='running', locked_by=worker, locked_at=now).order_by('run_at', 'id'))
+
+
+def _succeeded(job):
+    Job.objects.filter(pk=job.pk).update(status='done', finished_at=timezone.now(), attempts=job.attempts + 1, last_error='')
+
+
+def _failed(job, error):
+    attempts = job.attempts + 1
+    changes = {'attempts': attempts, 'locked_at': None, 'locked_by': '', 'last_error': error}
+    if attempts >= job.max_attempts:
+        changes.update(status='failed', finished_at=timezone.now())
+    else:
+        changes.update(status='queued', run_at=timezone.now() + datetime.timedelta(seconds=backoff(attempts)))
+    Job.objects.filter(pk=job.pk).update(**changes)
+
+
+def run(jobs):
+    """Run claimed jobs. Returns (succeeded, failed) counts."""
+    outgoing = []
+    succeeded = failed = 0
+    for job in jobs:
+        registered = _tasks.get(job.name)
+        try:
+            if registered is None:
+                raise LookupError(f'No task registered as {job.name!r}')
+            result = registered.func(job.payload)
+        except Exception:
+            _failed(job, traceback.format_exc())
+            failed += 1
+            continue
+        if registered.mail and result is not None:
+            outgoing.append((job, result))
+        else:
+            _succeeded(job)
+            succeeded += 1
+
+    if outgoing:
+        sent, not_sent = _send_mail(outgoing)
+        succeeded += sent
+        failed += not_sent
+    return succeeded, failed
+
+
+def _send_mail(outgoing):
+    """Send every message over a single backend connection, failing only the jobs whose message failed."""
+    connection = get_connection()
+    sent = not_sent = 0
+    try:
+        connection.open()
+    except Exception:
+        error = traceback.format_exc()
+        for job, _ in outgoing:
+            _failed(job, error)
+        return 0, len(outgoing)
+    try:
+        for job, message in outgoing:
+            try:
+                message.connection = connection
+                message.send()
+            except Exception:
+                _failed(job, traceback.format_exc())
+                not_sent += 1
+            else:
+                _succeeded(job)
+                sent += 1
+    finally:
+        connection.close()
+    return sent, not_sent
+
+
+def requeue_stuck(timeout=LOCK_TIMEOUT):
+    """Return jobs whose worker stopped without finishing them to the queue. Returns how many."""
+    cutoff = timezone.now() - datetime.timedelta(seconds=timeout)
+    return Job.objects.filter(status='running', locked_at__lt=cutoff).update(
+        status='queued', locked_at=None, locked_by='', last_error='Requeued: worker lock expired',
+    )
+
+
+def stuck(timeout=LOCK_TIMEOUT):
+    cutoff = timezone.now() - datetime.timedelta(seconds=timeout)
+    return Job.objects.filter(status='running', locked_at__lt=cutoff)
+
+
+def retry(queryset):
+    """Queue failed (or any) jobs again right away with a fresh attempt budget."""
+    return queryset.exclude(status='running').update(
+        status='queued', attempts=0, run_at=timezone.now(), locked_at=None, locked_by='', finished_at=None,
+    )
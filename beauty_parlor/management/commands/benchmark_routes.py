@@ -0,0 +1,141 @@
+import datetime
+import json
+import platform
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.utils import timezone
+from beauty_parlor.benchmark import Route, compare, run_route
+from beauty_parlor.models import Booking, Service
+
+BENCH_KEY_PREFIX = 'bench-'
+CLONE_SUFFIX = 'benchmark'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark latency, throughput and query counts of the main routes against a copy of the current database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Timed requests per route (default: 200)')
+        parser.add_argument('--concurrency', type=int, default=1, help='Worker threads per route (default: 1)')
+        parser.add_argument('--warmup', type=int, default=10, help='Untimed warmup requests per route')
+        parser.add_argument('--routes', nargs='*', help='Only run these routes')
+        parser.add_argument('--user', help='Username for authenticated routes (default: the user with most bookings)')
+        parser.add_argument('--password', default='synthetic', help='Password of --user, for the login route')
+        parser.add_argument('--output', default=str(settings.BASE_DIR / 'benchmark_results.json'), help='Where to write JSON results')
+        parser.add_argument('--compare', help='Earlier results file; fail if any route regressed')
+        parser.add_argument('--threshold', type=float, default=0.2, help='Allowed p95 growth for --compare (default: 0.2)')
+
+    def pick_user(self, username):
+        if username:
+            return User.objects.get(username=username)
+        busiest = (
+            Booking.objects.filter(user__isnull=False)
+            .values('user').annotate(total=Count('id')).order_by('-total').first()
+        )
+        if busiest is None:
+            raise CommandError('No bookings found. Generate a dataset with generate_synthetic_data first.')
+        return User.objects.get(id=busiest['user'])
+
+    def build_routes(self, user, password):
+        service = Service.objects.filter(is_home_service=True).order_by('id').first()
+        booking = Booking.objects.filter(user=user).order_by('-created_at').first()
+        first_day = timezone.localdate() + datetime.timedelta(days=3650)
+
+        def logged_in():
+            client = Client()
+            client.force_login(user)
+            return client
+
+        def book(client, i):
+            # One request per future day keeps every POST on a free slot
+            return client.post('/booking/', {
+                'service': service.id,
+                'date': (first_day + datetime.timedelta(days=i)).isoformat(),
+                'time': '10:00',
+                'address': 'Benchmark address',
+                'idempotency_key': f'{BENCH_KEY_PREFIX}{i}',
+            })
+
+        return [
+            Route('home', lambda client, i: client.get('/')),
+            Route('services', lambda client, i: client.get('/services/')),
+            Route('services_search', lambda client, i: client.get('/services/', {'search': 'facial'})),
+            Route('service_detail', lambda client, i: client.get(f'/service/{service.id}/')),
+            Route('testimonials', lambda client, i: client.get('/testimonials/')),
+            Route('login_page', lambda client, i: client.get('/login/')),
+            Route('login', lambda client, i: Client().post('/login/', {'username': user.username, 'password': password})),
+            Route('booking_post', book, logged_in),
+            Route('my_bookings', lambda client, i: client.get('/my-bookings/'), logged_in),
+            Route('profile', lambda client, i: client.get('/profile/'), logged_in),
+            Route('booking_detail', lambda client, i: client.get(f'/booking/{booking.id}/'), logged_in),
+            Route('recommendations', lambda client, i: client.get('/recommendations/'), logged_in),
+        ]
+
+    def handle(self, *args, **options):
+        user = self.pick_user(options['user'])
+        routes = self.build_routes(user, options['password'])
+        if options['routes']:
+            routes = [route for route in routes if route.name in options['routes']]
+        meta = {
+            'timestamp': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'database': settings.DATABASES['default']['ENGINE'],
+            'bookings': Booking.objects.count(),
+            'users': User.objects.count(),
+            'user': user.username,
+            'user_bookings': Booking.objects.filter(user=user).count(),
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+        }
+
+        # The routes write bookings, jobs, sessions and login stamps, so they run against a
+        # copy of the database that is dropped afterwards. Cache keys get a prefix of their own
+        # per run, so nothing cached from a copy is served to the site or to a later run.
+        connection.close()
+        connection.creation.clone_test_db(CLONE_SUFFIX, verbosity=0, autoclobber=True)
+        old_name = connection.settings_dict['NAME']
+        clone_name = connection.creation.get_test_db_clone_settings(CLONE_SUFFIX)['NAME']
+        settings.DATABASES[connection.alias]['NAME'] = clone_name
+        connection.settings_dict['NAME'] = clone_name
+        run_prefix = f'{BENCH_KEY_PREFIX}{uuid.uuid4().hex[:8]}'
+        bench_caches = {
+            alias: {**config, 'KEY_PREFIX': f"{config.get('KEY_PREFIX', '')}{run_prefix}"}
+            for alias, config in settings.CACHES.items()
+        }
+
+        results = {}
+        # Production-like settings: no per-query debug logging, any Host accepted by the test client,
+        # and no throttling, so login and booking_post measure the views rather than 429s
+        try:
+            with override_settings(DEBUG=False, ALLOWED_HOSTS=['*'], THROTTLE_RATES={}, CACHES=bench_caches):
+                for route in routes:
+                    results[route.name] = run_route(route, options['requests'], options['concurrency'], options['warmup'])
+                    result = results[route.name]
+                    self.stdout.write(
+                        f"{route.name:<16} p50 {result['p50_ms']:>8.2f}ms  p95 {result['p95_ms']:>8.2f}ms  "
+                        f"p99 {result['p99_ms']:>8.2f}ms  {result['rps']:>8.1f} req/s  {result['queries']:>3} queries  "
+                        f"{result['statuses']}"
+                    )
+                    for error in result['errors']:
+                        self.stdout.write(self.style.ERROR(f'  {error}'))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report = {'meta': meta, 'routes': results}
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        if options['compare']:
+            with open(options['compare']) as f:
+                previous = json.load(f)['routes']
+            regressions = compare(previous, results, options['threshold'])
+            if regressions:
+                raise CommandError('Regressions found:\n  ' + '\n  '.join(regressions))
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['compare']}"))
@@ -0,0 +1,94 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.test import Client, override_settings
+from beauty_parlor.benchmark import run_asgi, run_wsgi
+from beauty_parlor.models import Booking, Service
+
+SERVERS = {'wsgi': run_wsgi, 'asgi': run_asgi}
+
+
+class Command(BaseCommand):
+    help = 'Compare WSGI (sync views, threads) and ASGI (async views, one event loop) throughput at high concurrency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Requests per route (default: 500)')
+        parser.add_argument('--concurrency', type=int, default=64, help='Concurrent threads/tasks (default: 64)')
+        parser.add_argument('--server', choices=SERVERS, help='Benchmark only this mode in the current process')
+
+    def handle(self, *args, **options):
+        if options['server']:
+            # Child mode: the URLconf picked sync or async views when it was imported
+            results = self.run_server(options['server'], options['requests'], options['concurrency'])
+            self.stdout.write(json.dumps(results))
+            return
+
+        results = {server: self.spawn(server, options) for server in SERVERS}
+        self.stdout.write(f"{'route':<18}{'':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}  statuses")
+        for route in results['wsgi']:
+            for server in SERVERS:
+                result = results[server][route]
+                self.stdout.write(
+                    f"{route if server == 'wsgi' else '':<18}{server:>6}{result['rps']:>10.1f}{result['p50_ms']:>10.2f}"
+                    f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}  {result['statuses']}"
+                )
+                for error in result['errors']:
+                    self.stdout.write(self.style.ERROR(f'  {error}'))
+            speedup = results['asgi'][route]['rps'] / results['wsgi'][route]['rps'] if results['wsgi'][route]['rps'] else 0
+            self.stdout.write(f"{'':<18}{'':>6}  ASGI/WSGI throughput: {speedup:.2f}x")
+
+        output = settings.BASE_DIR / 'benchmark_servers.json'
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {output}'))
+
+    def spawn(self, server, options):
+        self.stdout.write(f'  - Running {server.upper()} with {options["concurrency"]} concurrent clients...')
+        env = {**os.environ, 'DJANGO_ASYNC_VIEWS': '1' if server == 'asgi' else '0'}
+        env.setdefault('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE)
+        completed = subprocess.run(
+            [
+                sys.executable, str(settings.BASE_DIR / 'manage.py'), 'benchmark_servers',
+                '--server', server, '--requests', str(options['requests']), '--concurrency', str(options['concurrency']),
+            ],
+            env=env, capture_output=True, text=True,
+        )
+        if completed.returncode:
+            raise CommandError(f'{server} benchmark failed:\n{completed.stderr}')
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def routes(self):
+        busiest = (
+            Booking.objects.filter(user__isnull=False)
+            .values('user').annotate(total=Count('id')).order_by('-total').first()
+        )
+        service = Service.objects.order_by('id').first()
+        if busiest is None or service is None:
+            raise CommandError('No bookings found. Generate a dataset with generate_synthetic_data first.')
+        client = Client()
+        client.force_login(User.objects.get(id=busiest['user']))
+        cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+        return [
+            ('home', '/', ''),
+            ('services', '/services/', ''),
+            ('services_search', '/services/?search=facial', ''),
+            ('service_detail', f'/service/{service.id}/', ''),
+            ('testimonials', '/testimonials/', ''),
+            ('my_bookings', '/my-bookings/', cookie),
+            ('recommendations', '/recommendations/', cookie),
+        ]
+
+    def run_server(self, server, requests, concurrency):
+        run = SERVERS[server]
+        results = {}
+        with override_settings(DEBUG=False, ALLOWED_HOSTS=['*']):
+            for name, path, cookie in self.routes():
+                run(path, min(concurrency, 10), min(concurrency, 10), cookie)  # warm caches and connections
+                results[name] = run(path, requests, concurrency, cookie)
+        return results
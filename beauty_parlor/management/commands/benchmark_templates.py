@@ -0,0 +1,104 @@
+import copy
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from beauty_parlor.benchmark import Route, run_templates
+from beauty_parlor.models import Service
+
+PLAIN_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+CACHED_LOADERS = [('django.template.loaders.cached.Loader', PLAIN_LOADERS)]
+NO_FRAGMENT_CACHE = {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+
+# name: (template loaders, fragment caching on)
+MODES = {
+    'uncached': (PLAIN_LOADERS, False),
+    'cached_loader': (CACHED_LOADERS, False),
+    'cached_loader+fragments': (CACHED_LOADERS, True),
+}
+
+
+class Command(BaseCommand):
+    help = 'Measure template time per request with and without the cached loader and fragment caching'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100, help='Timed requests per route and mode (default: 100)')
+        parser.add_argument('--warmup', type=int, default=10, help='Untimed warmup requests per route and mode')
+        parser.add_argument('--modes', nargs='*', choices=list(MODES), help='Only run these modes')
+        parser.add_argument('--output', help='Also write the results as JSON to this file')
+
+    def build_routes(self):
+        service = Service.objects.order_by('id').first()
+        if service is None:
+            raise CommandError('No services found. Run populate_data or generate_synthetic_data first.')
+        user = User.objects.order_by('id').first()
+
+        routes = [
+            Route('home', lambda client, i: client.get('/')),
+            Route('about', lambda client, i: client.get('/about/')),
+            Route('services', lambda client, i: client.get('/services/')),
+            Route('services_page2', lambda client, i: client.get('/services/', {'page': 2})),
+            Route('service_detail', lambda client, i: client.get(f'/service/{service.id}/')),
+            Route('testimonials', lambda client, i: client.get('/testimonials/')),
+            Route('contact', lambda client, i: client.get('/contact/')),
+        ]
+        if user is not None:
+            def logged_in():
+                client = Client()
+                client.force_login(user)
+                return client
+
+            # Logged-in pages render the navbar every time; the cards are still shared
+            routes.append(Route('services_logged_in', lambda client, i: client.get('/services/'), logged_in))
+        return routes
+
+    def mode_settings(self, loaders, fragments):
+        templates = copy.deepcopy(settings.TEMPLATES)
+        templates[0]['OPTIONS']['loaders'] = loaders
+        cache_settings = dict(settings.CACHES)
+        if not fragments:
+            cache_settings['template_fragments'] = NO_FRAGMENT_CACHE
+        # Production-like settings: no per-query debug logging, any Host accepted by the test client
+        return override_settings(TEMPLATES=templates, CACHES=cache_settings, DEBUG=False, ALLOWED_HOSTS=['*'])
+
+    def handle(self, *args, **options):
+        routes = self.build_routes()
+        modes = options['modes'] or list(MODES)
+
+        results = {}
+        for mode in modes:
+            loaders, fragments = MODES[mode]
+            self.stdout.write(self.style.MIGRATE_HEADING(mode))
+            with self.mode_settings(loaders, fragments):
+                if fragments:
+                    # Start from an empty fragment cache; the warmup requests fill it
+                    caches['default'].clear()
+                results[mode] = {}
+                for route in routes:
+                    result = run_templates(route, options['requests'], options['warmup'])
+                    results[mode][route.name] = result
+                    self.stdout.write(
+                        f"  {route.name:<20} templates p50 {result['template_p50_ms']:>7.2f}ms  "
+                        f"mean {result['template_mean_ms']:>7.2f}ms  p95 {result['template_p95_ms']:>7.2f}ms  "
+                        f"request p50 {result['total_p50_ms']:>7.2f}ms  {result['statuses']}"
+                    )
+
+        if len(modes) > 1:
+            first, last = modes[0], modes[-1]
+            self.stdout.write(self.style.MIGRATE_HEADING(f'Mean template time per request, {first} -> {last}'))
+            for route in routes:
+                before = results[first][route.name]['template_mean_ms']
+                after = results[last][route.name]['template_mean_ms']
+                change = f'{(after - before) / before:+.0%}' if before else 'n/a'
+                self.stdout.write(f'  {route.name:<20} {before:>7.2f}ms -> {after:>7.2f}ms  ({change})')
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
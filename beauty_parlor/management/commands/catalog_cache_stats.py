@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from beauty_parlor import catalog_cache
+
+
+class Command(BaseCommand):
+    help = 'Show hit/miss counters for the catalog cache (needs a shared backend such as CACHE_BACKEND=file)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after printing them')
+
+    def handle(self, *args, **options):
+        stats = catalog_cache.stats()
+        total = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / total * 100 if total else 0
+        self.stdout.write(f"Hits: {stats['hits']}  Misses: {stats['misses']}  Hit ratio: {ratio:.1f}%")
+
+        if options['reset']:
+            catalog_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset'))
@@ -0,0 +1,151 @@
+import datetime
+import re
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from beauty_parlor.models import Area, Booking, Service, Testimonial
+
+# Plan lines that mean "read the whole table"; older SQLite versions print "SCAN TABLE x"
+FULL_SCAN = {
+    'sqlite': re.compile(r'^SCAN (?:TABLE )?(\w+)$'),
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+}
+# A sort in the plan: the scan can't stop early at the LIMIT
+SORT = re.compile(r'TEMP B-TREE FOR ORDER BY|\bSort\b')
+EXPLAIN = {
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+    'postgresql': 'EXPLAIN ',
+}
+# Tables bounded by the catalog rather than by traffic, and the schema table SQLite
+# introspection reads once per process; scanning them is expected
+SMALL_TABLES = {model._meta.db_table for model in (Service, Testimonial, Area)} | {'sqlite_master', 'sqlite_schema'}
+# Below this many bookings the planner's choices say little about production
+LARGE_DATASET = 10_000
+NO_CACHE = {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Request the main views, EXPLAIN every query they run and fail if any falls back to a full table scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan, not just failures')
+
+    def sample_arguments(self):
+        busiest = (
+            Booking.objects.filter(user__isnull=False)
+            .values('user').annotate(total=Count('id')).order_by('-total').first()
+        )
+        service = Service.objects.order_by('id').first()
+        if busiest is None or service is None:
+            raise CommandError('No bookings found. Generate a dataset with generate_synthetic_data first.')
+        return User.objects.get(pk=busiest['user']), service
+
+    def requests(self):
+        """(label, client, path, query) for each request to check."""
+        customer, service = self.sample_arguments()
+        # Only exists inside the rolled-back transaction handle() runs in
+        admin = User.objects.create_superuser('query-plan-check', 'query-plan-check@example.com', None)
+        anonymous, signed_in, staff = Client(), Client(), Client()
+        signed_in.force_login(customer)
+        staff.force_login(admin)
+
+        today = datetime.date.today()
+        month_ago = today - datetime.timedelta(days=30)
+        return [
+            # Views
+            ('home', anonymous, '/', {}),
+            ('services', anonymous, '/services/', {}),
+            ('services: by category', anonymous, '/services/', {'category': service.category}),
+            ('services: search', anonymous, '/services/', {'search': service.name.split()[0]}),
+            ('service_detail', anonymous, f'/service/{service.id}/', {}),
+            ('availability', anonymous, f'/availability/{service.id}/', {'date': today.isoformat()}),
+            ('booking form', signed_in, '/booking/', {}),
+            ('my_bookings', signed_in, '/my-bookings/', {}),
+            ('my_bookings: by status', signed_in, '/my-bookings/', {'status': 'completed'}),
+            ('recommendations', signed_in, '/recommendations/', {}),
+            ('api services', anonymous, '/api/services/', {}),
+            ('api bookings', signed_in, '/api/bookings/', {}),
+            # Admin changelists and their filters
+            ('admin bookings', staff, '/admin/beauty_parlor/booking/', {}),
+            ('admin bookings: status', staff, '/admin/beauty_parlor/booking/', {'status__exact': 'pending', 'date__gte': month_ago.isoformat()}),
+            ('admin bookings: date range', staff, '/admin/beauty_parlor/booking/', {'date__gte': month_ago.isoformat(), 'date__lte': today.isoformat()}),
+            ('admin bookings: salon visits', staff, '/admin/beauty_parlor/booking/', {'is_home_service__exact': '0'}),
+            ('admin reviews: rating', staff, '/admin/beauty_parlor/review/', {'rating__exact': '1'}),
+        ]
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(EXPLAIN[connection.vendor] + sql)
+            rows = cursor.fetchall()
+        # SQLite rows are (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+
+    def check_request(self, label, client, path, query, pattern, verbose):
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(path, query)
+        if response.status_code != 200:
+            raise CommandError(f'{label}: {path} answered {response.status_code}')
+
+        statements = list(dict.fromkeys(
+            entry['sql'] for entry in captured.captured_queries
+            if entry['sql'].lstrip().upper().startswith(('SELECT', 'WITH'))
+        ))
+        failures = []
+        for sql in statements:
+            plan = self.explain(sql)
+            scans = [
+                match.group(1) for line in plan
+                if (match := pattern.search(line.strip())) and match.group(1) not in SMALL_TABLES
+            ]
+            upper = sql.upper()
+            if scans and ' ORDER BY ' in upper and ' LIMIT ' in upper and not any(SORT.search(line) for line in plan):
+                # Reads the table in the requested order and stops after LIMIT rows, e.g. a changelist's first page
+                scans = []
+            if scans:
+                failures.append(f"{label}: full scan of {', '.join(scans)}")
+                self.stdout.write(self.style.ERROR(f'  - {label}: full scan of {", ".join(scans)}'))
+                self.stdout.write(f'      {sql[:500]}')
+            if verbose or scans:
+                for line in plan:
+                    self.stdout.write(f'      {line}')
+        if not failures:
+            self.stdout.write(f'  - {label}: {len(statements)} queries ok')
+        return failures
+
+    def handle(self, *args, **options):
+        pattern = FULL_SCAN.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f'Query plan checks are not implemented for {connection.vendor}')
+
+        bookings = Booking.objects.count()
+        if bookings < LARGE_DATASET:
+            self.stdout.write(self.style.WARNING(
+                f'Only {bookings:,} bookings; plans on small tables may differ from production. '
+                'Consider generate_synthetic_data first.'
+            ))
+
+        failures = []
+        # No caches, so every query a view can run is actually run; the logins, sessions and
+        # the throwaway admin user are rolled back afterwards
+        no_caches = {alias: NO_CACHE for alias in settings.CACHES}
+        with override_settings(CACHES=no_caches, DEBUG=False, ALLOWED_HOSTS=['*'], THROTTLE_RATES={}):
+            try:
+                with transaction.atomic():
+                    for label, client, path, query in self.requests():
+                        failures += self.check_request(label, client, path, query, pattern, options['verbose_plans'])
+                    raise Rollback
+            except Rollback:
+                pass
+
+        if failures:
+            raise CommandError(f'{len(failures)} queries use a full table scan')
+        self.stdout.write(self.style.SUCCESS('All view queries use an index'))
@@ -0,0 +1,50 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from beauty_parlor import exports
+from beauty_parlor.models import Booking, Contact
+
+EXPORTS = {
+    'bookings': (Booking, exports.BOOKING_COLUMNS),
+    'contacts': (Contact, exports.CONTACT_COLUMNS),
+}
+
+
+class Command(BaseCommand):
+    help = 'Stream bookings or contacts as CSV or NDJSON to a file or stdout, in constant memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=EXPORTS)
+        parser.add_argument('--format', choices=exports.FORMATS, default='csv')
+        parser.add_argument('--output', '-o', help='File to write (default: stdout)')
+        parser.add_argument('--since', help='Only rows created on or after this date (YYYY-MM-DD)')
+        parser.add_argument('--until', help='Only rows created on or before this date (YYYY-MM-DD)')
+        parser.add_argument('--status', help='Bookings only: only this status')
+
+    def handle(self, *args, **options):
+        model, columns = EXPORTS[options['dataset']]
+        queryset = model.objects.order_by('id')
+        for option, lookup in (('since', 'created_at__date__gte'), ('until', 'created_at__date__lte')):
+            if options[option]:
+                day = parse_date(options[option])
+                if day is None:
+                    raise CommandError(f'--{option} must be a date as YYYY-MM-DD')
+                queryset = queryset.filter(**{lookup: day})
+        if options['status']:
+            if model is not Booking:
+                raise CommandError('--status only applies to bookings')
+            queryset = queryset.filter(status=options['status'])
+
+        lines = exports.lines(queryset, columns, options['format'])
+        if not options['output']:
+            for line in lines:
+                sys.stdout.write(line)
+            return
+
+        written = -1 if options['format'] == 'csv' else 0  # the CSV header isn't a row
+        with open(options['output'], 'w', encoding='utf-8', newline='') as f:
+            for line in lines:
+                f.write(line)
+                written += 1
+        self.stdout.write(self.style.SUCCESS(f'Exported {written} {options["dataset"]} to {options["output"]}'))
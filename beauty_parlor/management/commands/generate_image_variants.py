@@ -0,0 +1,63 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import connections
+from beauty_parlor import images
+from beauty_parlor.models import Service, Testimonial, UserProfile
+
+
+def _init_worker(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def _process(name):
+    return name, images.generate_variants(default_storage, name)
+
+
+class Command(BaseCommand):
+    help = 'Generate responsive thumbnail and WebP variants for existing service, testimonial and profile images'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of worker processes (default: one per CPU)',
+        )
+
+    def handle(self, *args, **options):
+        names = set()
+        names.update(Service.objects.exclude(image='').exclude(image=None).values_list('image', flat=True))
+        names.update(Testimonial.objects.exclude(image='').exclude(image=None).values_list('image', flat=True))
+        names.update(
+            UserProfile.objects.exclude(profile_picture='').exclude(profile_picture=None).values_list('profile_picture', flat=True)
+        )
+        if not names:
+            self.stdout.write('No images to process')
+            return
+
+        # Workers only touch storage; don't let them inherit open database connections
+        connections.close_all()
+        self.stdout.write(f'Processing {len(names)} images with {options["workers"]} workers...')
+        processed = failed = 0
+        with ProcessPoolExecutor(
+            max_workers=options['workers'],
+            initializer=_init_worker,
+            initargs=(os.environ['DJANGO_SETTINGS_MODULE'],),
+        ) as executor:
+            futures = {executor.submit(_process, name): name for name in sorted(names)}
+            for future in as_completed(futures):
+                try:
+                    name, widths = future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stdout.write(self.style.WARNING(f'Failed to process {futures[future]}: {e}'))
+                    continue
+                processed += 1
+                self.stdout.write(f'  - {name}: {", ".join(f"{w}w" for w in widths) or "already small"}')
+
+        self.stdout.write(self.style.SUCCESS(f'Generated variants for {processed} images ({failed} failed)'))
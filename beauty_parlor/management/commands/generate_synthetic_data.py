@@ -0,0 +1,255 @@
+import datetime
+import itertools
+import random
+from contextlib import contextmanager
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from beauty_parlor import availability, ratings, rollups
+from beauty_parlor.models import Booking, Contact, ItineraryStop, Review, Service, UserProfile
+
+# Row counts at --scale 1
+BASE_USERS = 200_000
+BASE_BOOKINGS = 2_000_000
+BASE_CONTACTS = 50_000
+
+USERNAME_PREFIX = 'synthetic_'
+HISTORY_DAYS = 730
+
+FIRST_NAMES = ['Aarti', 'Ananya', 'Divya', 'Isha', 'Kavya', 'Meera', 'Neha', 'Pooja', 'Priya', 'Riya', 'Sakshi', 'Sneha', 'Tanvi', 'Anjali', 'Nisha', 'Shruti']
+LAST_NAMES = ['Sharma', 'Patel', 'Desai', 'Gupta', 'Reddy', 'Singh', 'Mehta', 'Iyer', 'Joshi', 'Kapoor', 'Nair', 'Shah']
+AREAS = [
+    ('Andheri West', '400058'), ('Bandra West', '400050'), ('Borivali West', '400092'), ('Chembur', '400071'),
+    ('Dadar West', '400028'), ('Ghatkopar East', '400077'), ('Goregaon East', '400063'), ('Juhu', '400049'),
+    ('Kandivali East', '400101'), ('Malad West', '400064'), ('Mulund West', '400080'), ('Powai', '400076'),
+    ('Santacruz East', '400055'), ('Thane West', '400601'), ('Vile Parle East', '400057'), ('Worli', '400018'),
+]
+STREETS = ['MG Road', 'Link Road', 'SV Road', 'Station Road', 'Hill Road', 'LBS Marg', 'Carter Road', 'Linking Road']
+SUBJECTS = ['Booking enquiry', 'Bridal package', 'Reschedule request', 'Feedback', 'Pricing question', 'Home visit timing']
+COMMENTS = [
+    'Very professional and punctual.', 'Loved the results, will book again!', 'Good service but arrived a little late.',
+    'Excellent products and friendly staff.', 'Average experience, expected more.', 'Perfect for my party, thank you!',
+]
+# Appointment hours skew towards late morning and evening
+HOURS = list(range(9, 20))
+HOUR_WEIGHTS = [4, 7, 9, 8, 6, 6, 7, 8, 9, 7, 4]
+RATINGS = [1, 2, 3, 4, 5]
+RATING_WEIGHTS = [3, 5, 12, 35, 45]
+
+
+@contextmanager
+def manual_timestamps(*fields):
+    """Let bulk_create keep the timestamps we generate instead of stamping 'now'."""
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Generate a deterministic, large synthetic dataset (users, profiles, bookings, reviews, contacts) for performance testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+        parser.add_argument(
+            '--scale',
+            type=float,
+            default=0.01,
+            help=f'Multiplier on {BASE_USERS:,} users, {BASE_BOOKINGS:,} bookings and {BASE_CONTACTS:,} contacts (default: 0.01)',
+        )
+        parser.add_argument('--review-rate', type=float, default=0.3, help='Share of completed bookings that get a review')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert')
+        parser.add_argument(
+            '--end-date',
+            type=datetime.date.fromisoformat,
+            default=None,
+            help='Last day of generated history, YYYY-MM-DD (default: today); fix it for byte-identical reruns',
+        )
+        parser.add_argument('--clear', action='store_true', help='Delete previously generated synthetic data first')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        end_date = options['end_date'] or timezone.localdate()
+        self.end = timezone.make_aware(datetime.datetime.combine(end_date, datetime.time(21, 0)))
+        scale = options['scale']
+
+        services = list(Service.objects.order_by('id'))
+        if not services:
+            raise CommandError('No services found. Run populate_data (or populate_data --offline) first.')
+
+        if options['clear']:
+            self.clear(services)
+
+        user_ids = self.create_users(int(BASE_USERS * scale), options['seed'])
+        self.create_bookings(int(BASE_BOOKINGS * scale), user_ids, services, options['review_rate'])
+        self.create_contacts(int(BASE_CONTACTS * scale))
+        # bulk_create and the raw deletes in clear() skip the signals that keep Service rating
+        # totals and booking rollups current
+        ratings.reconcile()
+        rollups.rebuild()
+
+        self.stdout.write(self.style.SUCCESS('Synthetic dataset generated. Run refresh_recommendations --full to score the new bookings.'))
+
+    def clear(self, services):
+        """
+        Delete the synthetic users and everything they own. Their delete receivers keep
+        rollups, ratings and availability current one row at a time, which stops Django
+        from fast-deleting bookings and reviews; those go with raw deletes instead and the
+        totals are rebuilt once after generation.
+        """
+        users = User.objects.filter(username__startswith=USERNAME_PREFIX)
+        bookings = Booking.objects.filter(user__in=users)
+        by_id = {service.id: service for service in services}
+        with transaction.atomic():
+            upcoming = bookings.filter(date__gte=timezone.localdate()).values_list('service_id', 'date').distinct()
+            stale_days = [(by_id[service_id], day) for service_id, day in upcoming]
+            deleted = sum(
+                queryset._raw_delete(queryset.db)
+                for queryset in (
+                    ItineraryStop.objects.filter(booking__in=bookings),
+                    Review.objects.filter(booking__in=bookings),
+                    bookings,
+                )
+            )
+            # What is left per user (profile, scores) is small enough for a normal delete
+            deleted += users.delete()[0]
+            deleted += Contact.objects.filter(email__endswith='@synthetic.example').delete()[0]
+        for service, day in stale_days:
+            availability.invalidate(service, day)
+        self.stdout.write(f'  - Cleared {deleted:,} previously generated rows')
+
+    def batches(self, total):
+        for start in range(0, total, self.batch_size):
+            yield start, min(self.batch_size, total - start)
+
+    def random_moment(self, days_back):
+        return self.end - datetime.timedelta(seconds=self.rng.randrange(days_back * 86400))
+
+    def random_address(self):
+        area, pincode = self.rng.choice(AREAS)
+        return f'{self.rng.randint(1, 250)}, {self.rng.choice(STREETS)}, {area}, Mumbai {pincode}'
+
+    def create_users(self, total, seed):
+        self.stdout.write(f'Creating {total:,} users and profiles...')
+        # Hashing is deliberately slow; every synthetic user shares one password ("synthetic")
+        password = make_password('synthetic')
+        user_ids = []
+        profile_fields = [UserProfile._meta.get_field('created_at'), UserProfile._meta.get_field('updated_at')]
+        with manual_timestamps(*profile_fields):
+            for start, size in self.batches(total):
+                users = []
+                for i in range(start, start + size):
+                    first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+                    users.append(User(
+                        username=f'{USERNAME_PREFIX}{seed}_{i}',
+                        first_name=first,
+                        last_name=last,
+                        email=f'{first.lower()}.{last.lower()}.{i}@synthetic.example',
+                        password=password,
+                        date_joined=self.random_moment(HISTORY_DAYS + 365),
+                    ))
+                with transaction.atomic():
+                    users = User.objects.bulk_create(users)
+                    if users[0].pk is None:
+                        lookup = dict(User.objects.filter(username__in=[u.username for u in users]).values_list('username', 'id'))
+                        for user in users:
+                            user.pk = lookup[user.username]
+                    UserProfile.objects.bulk_create([
+                        UserProfile(
+                            user_id=user.pk,
+                            phone=f'9{self.rng.randrange(10 ** 9):09d}',
+                            address=self.random_address(),
+                            created_at=user.date_joined,
+                            updated_at=user.date_joined,
+                        )
+                        for user in users
+                    ])
+                user_ids.extend(user.pk for user in users)
+                self.stdout.write(f'  - {start + size:,} users')
+        return user_ids
+
+    def booking_status(self, day):
+        today = self.end.date()
+        if day < today:
+            return self.rng.choices(['completed', 'cancelled', 'confirmed', 'pending'], [78, 12, 7, 3])[0]
+        return self.rng.choices(['pending', 'confirmed', 'cancelled'], [55, 40, 5])[0]
+
+    def create_bookings(self, total, user_ids, services, review_rate):
+        if not user_ids or not total:
+            return
+        self.stdout.write(f'Creating {total:,} bookings...')
+        # A few loyal customers book a lot; most book a handful of times. Same for services.
+        user_weights = list(itertools.accumulate(1 / (rank + 1) ** 0.8 for rank in range(len(user_ids))))
+        service_weights = list(itertools.accumulate(1 / (rank + 1) ** 0.6 for rank in range(len(services))))
+        shuffled_services = services[:]
+        self.rng.shuffle(shuffled_services)
+        shuffled_users = user_ids[:]
+        self.rng.shuffle(shuffled_users)
+
+        booking_fields = [Booking._meta.get_field('created_at'), Booking._meta.get_field('updated_at')]
+        review_fields = [Review._meta.get_field('created_at')]
+        reviews_total = 0
+        with manual_timestamps(*booking_fields, *review_fields):
+            for start, size in self.batches(total):
+                owners = self.rng.choices(shuffled_users, cum_weights=user_weights, k=size)
+                picked = self.rng.choices(shuffled_services, cum_weights=service_weights, k=size)
+                bookings = []
+                for user_id, service in zip(owners, picked):
+                    created_at = self.random_moment(HISTORY_DAYS)
+                    day = created_at.date() + datetime.timedelta(days=min(int(self.rng.expovariate(1 / 5)), 60))
+                    hour = self.rng.choices(HOURS, HOUR_WEIGHTS)[0]
+                    bookings.append(Booking(
+                        user_id=user_id,
+                        service=service,
+                        date=day,
+                        time=datetime.time(hour, self.rng.choice((0, 30))),
+                        address=self.random_address(),
+                        is_home_service=self.rng.random() < 0.85,
+                        status=self.booking_status(day),
+                        special_requests='' if self.rng.random() < 0.8 else 'Please bring hypoallergenic products.',
+                        total_amount=service.price,
+                        created_at=created_at,
+                        updated_at=created_at,
+                    ))
+
+                with transaction.atomic():
+                    bookings = Booking.objects.bulk_create(bookings)
+                    reviews = [
+                        Review(
+                            user_id=booking.user_id,
+                            booking_id=booking.pk,
+                            rating=self.rng.choices(RATINGS, RATING_WEIGHTS)[0],
+                            comment=self.rng.choice(COMMENTS),
+                            created_at=booking.created_at + datetime.timedelta(days=(booking.date - booking.created_at.date()).days + 1),
+                        )
+                        for booking in bookings
+                        if booking.pk and booking.status == 'completed' and self.rng.random() < review_rate
+                    ]
+                    Review.objects.bulk_create(reviews)
+                reviews_total += len(reviews)
+                self.stdout.write(f'  - {start + size:,} bookings, {reviews_total:,} reviews')
+
+    def create_contacts(self, total):
+        self.stdout.write(f'Creating {total:,} contact messages...')
+        with manual_timestamps(Contact._meta.get_field('created_at')):
+            for start, size in self.batches(total):
+                contacts = []
+                for i in range(start, start + size):
+                    first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+                    contacts.append(Contact(
+                        name=f'{first} {last}',
+                        email=f'{first.lower()}.{i}@synthetic.example',
+                        phone=f'9{self.rng.randrange(10 ** 9):09d}',
+                        subject=self.rng.choice(SUBJECTS),
+                        message=self.rng.choice(COMMENTS),
+                        created_at=self.random_moment(HISTORY_DAYS),
+                    ))
+                Contact.objects.bulk_create(contacts)
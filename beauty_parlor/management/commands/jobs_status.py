@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Min
+from django.utils import timezone
+from beauty_parlor import jobs
+from beauty_parlor.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Show background job counts, queue lag, stuck jobs and recent failures'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--failures', type=int, default=5, help='Recent failed jobs to show')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        counts = dict(Job.objects.values_list('status').annotate(total=Count('id')))
+        self.stdout.write('  '.join(f'{status}: {counts.get(status, 0)}' for status, _ in Job._meta.get_field('status').choices))
+
+        oldest = Job.objects.filter(status='queued', run_at__lte=now).aggregate(oldest=Min('run_at'))['oldest']
+        if oldest:
+            self.stdout.write(f'Oldest due job has waited {(now - oldest).total_seconds():.0f}s')
+
+        stuck = list(jobs.stuck())
+        for job in stuck:
+            self.stdout.write(self.style.WARNING(
+                f'  - Stuck: {job} locked by {job.locked_by} {(now - job.locked_at).total_seconds():.0f}s ago'
+            ))
+
+        for job in Job.objects.filter(status='failed').order_by('-finished_at')[:options['failures']]:
+            last_line = job.last_error.strip().splitlines()[-1] if job.last_error else ''
+            self.stdout.write(self.style.ERROR(f'  - Failed: {job} after {job.attempts} attempts: {last_line}'))
+
+        if not stuck:
+            self.stdout.write(self.style.SUCCESS('No stuck jobs'))
@@ -0,0 +1,36 @@
+import csv
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from beauty_parlor.models import Area
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'mumbai_areas.csv')
+
+
+class Command(BaseCommand):
+    help = 'Load the area/pincode gazetteer used to place home-service addresses (name,pincode,latitude,longitude CSV)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default=DEFAULT_PATH, help='CSV file (default: the bundled Mumbai areas)')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+        except OSError as error:
+            raise CommandError(f'Cannot read {options["path"]}: {error}')
+
+        created = updated = 0
+        with transaction.atomic():
+            for row in rows:
+                try:
+                    coordinates = {'latitude': float(row['latitude']), 'longitude': float(row['longitude'])}
+                    name, pincode = row['name'].strip(), row['pincode'].strip()
+                except (KeyError, TypeError, ValueError):
+                    raise CommandError(f'Bad gazetteer row: {row}')
+                _, was_created = Area.objects.update_or_create(name=name, pincode=pincode, defaults=coordinates)
+                created += was_created
+                updated += not was_created
+
+        self.stdout.write(self.style.SUCCESS(f'Gazetteer loaded: {created} areas added, {updated} updated'))
@@ -0,0 +1,42 @@
+import datetime
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from beauty_parlor import dispatch
+
+
+class Command(BaseCommand):
+    help = "Group each day's home-service bookings into zones and plan the staff itineraries"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='First day to plan (YYYY-MM-DD, default: tomorrow)')
+        parser.add_argument('--days', type=int, default=1, help='Number of days to plan (default: 1)')
+
+    def handle(self, *args, **options):
+        if options['date']:
+            first = parse_date(options['date'])
+            if first is None:
+                raise CommandError('--date must be a date as YYYY-MM-DD')
+        else:
+            first = timezone.localdate() + datetime.timedelta(days=1)
+
+        gazetteer = dispatch.Gazetteer.load()
+        if not gazetteer.areas:
+            raise CommandError('The gazetteer is empty. Run load_gazetteer first.')
+
+        for offset in range(options['days']):
+            day = first + datetime.timedelta(days=offset)
+            started = time.perf_counter()
+            routes = dispatch.plan_day(day, gazetteer)
+            visits = sum(len(route.stops) for route in routes)
+            zones = Counter(route.zone for route in routes)
+            unresolved = sum(len(route.stops) for route in routes if route.zone == dispatch.UNRESOLVED_ZONE)
+            self.stdout.write(
+                f'  - {day}: {visits} visits in {len(zones)} zones, {len(routes)} itineraries'
+                f'{f", {unresolved} unresolved addresses" if unresolved else ""} ({time.perf_counter() - started:.2f}s)'
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'Planned {options["days"]} day(s) from {first}'))
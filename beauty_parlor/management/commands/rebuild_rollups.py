@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from beauty_parlor import rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily booking rollups behind the staff dashboard from the Booking table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='First booking date to rebuild (YYYY-MM-DD, default: all)')
+        parser.add_argument('--until', help='Last booking date to rebuild (YYYY-MM-DD, default: all)')
+
+    def handle(self, *args, **options):
+        dates = {}
+        for option in ('since', 'until'):
+            if options[option]:
+                dates[option] = parse_date(options[option])
+                if dates[option] is None:
+                    raise CommandError(f'--{option} must be a date as YYYY-MM-DD')
+
+        started = time.perf_counter()
+        rows = rollups.rebuild(**dates)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {rows:,} rollup rows in {time.perf_counter() - started:.1f}s'
+        ))
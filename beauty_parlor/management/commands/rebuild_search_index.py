@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from beauty_parlor import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for services'
+
+    def handle(self, *args, **options):
+        if not search.fts_available():
+            self.stdout.write(
+                self.style.WARNING('Full-text search table not found; run migrate on SQLite with FTS5 support.')
+            )
+            return
+
+        with transaction.atomic():
+            count = search.rebuild_index()
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} services'))
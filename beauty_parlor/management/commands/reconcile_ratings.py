@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from beauty_parlor import ratings
+
+
+class Command(BaseCommand):
+    help = "Recompute every service's stored rating totals from its reviews and repair any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report drifted services')
+
+    def handle(self, *args, **options):
+        drifted = ratings.reconcile(dry_run=options['dry_run'])
+        for service, stored, actual in drifted:
+            self.stdout.write(
+                f'  - {service.name}: stored {stored[0]}/{stored[1]} reviews, actual {actual[0]}/{actual[1]} reviews'
+            )
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('All rating totals match the reviews'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{len(drifted)} services have drifted'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Repaired {len(drifted)} services'))
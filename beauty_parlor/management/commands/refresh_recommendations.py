@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from beauty_parlor import recommendations
+
+
+class Command(BaseCommand):
+    help = 'Recompute service recommendations from bookings created since the last run'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Rebuild co-booking counts and every user\'s scores from scratch',
+        )
+
+    def handle(self, *args, **options):
+        run = recommendations.refresh(full=options['full'])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Scored {run.users_scored} users up to booking #{run.last_booking_id}'
+                f'{" (full rebuild)" if run.full_rebuild else ""}'
+            )
+        )
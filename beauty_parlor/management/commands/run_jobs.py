@@ -0,0 +1,38 @@
+import os
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from beauty_parlor import jobs
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (emails and other post-request work)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the jobs that are due now, then exit')
+        parser.add_argument('--batch-size', type=int, default=jobs.BATCH_SIZE, help='Jobs claimed per batch')
+        parser.add_argument('--sleep', type=float, default=1.0, help='Seconds to wait when the queue is empty')
+
+    def handle(self, *args, **options):
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+        self.stdout.write(f'Worker {worker} started')
+        try:
+            while True:
+                close_old_connections()
+                requeued = jobs.requeue_stuck()
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f'  - Requeued {requeued} stuck jobs'))
+
+                claimed = jobs.claim(worker, options['batch_size'])
+                if claimed:
+                    succeeded, failed = jobs.run(claimed)
+                    self.stdout.write(f'  - Ran {len(claimed)} jobs: {succeeded} succeeded, {failed} failed')
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f'Worker {worker} stopped'))
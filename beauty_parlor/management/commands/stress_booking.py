@@ -0,0 +1,101 @@
+import datetime
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from beauty_parlor import availability
+from beauty_parlor.bookings import SlotUnavailable, create_booking
+from beauty_parlor.forms import BookingForm
+from beauty_parlor.models import Booking, Service
+
+
+class Command(BaseCommand):
+    help = (
+        'Race parallel workers for the same booking slot and verify nothing is double-booked. '
+        'Runs against a throwaway copy of the schema, never the configured database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=16, help='Concurrent workers per round')
+        parser.add_argument('--rounds', type=int, default=5, help='Number of contested slots')
+
+    def worker(self, barrier, user, data, key, outcomes):
+        try:
+            form = BookingForm(data)
+            barrier.wait()
+            if not form.is_valid():
+                outcomes.append(('invalid', None))
+                return
+            try:
+                booking, created = create_booking(form, user, key)
+                outcomes.append(('created' if created else 'replayed', booking.id))
+            except SlotUnavailable:
+                outcomes.append(('rejected', None))
+        except Exception as error:
+            outcomes.append(('error', repr(error)))
+        finally:
+            connection.close()
+
+    def handle(self, *args, **options):
+        # A fresh test database (a temporary file on SQLite, so the workers contend for real file
+        # locks) and private caches, so nothing touches the configured database or shared caches
+        scratch_dir = tempfile.mkdtemp(prefix='stress_booking_')
+        if connection.vendor == 'sqlite':
+            connection.settings_dict['TEST']['NAME'] = os.path.join(scratch_dir, 'db.sqlite3')
+        private_caches = {
+            alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'stress-booking-{alias}'}
+            for alias in settings.CACHES
+        }
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(CACHES=private_caches):
+                failures = self.race(options['workers'], options['rounds'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+        if failures:
+            raise CommandError('Double booking detected: ' + '; '.join(failures))
+        self.stdout.write(self.style.SUCCESS(
+            f"No double bookings across {options['rounds']} rounds of {options['workers']} workers"
+        ))
+
+    def race(self, workers, rounds):
+        service = Service.objects.create(
+            name='Stress Test', description='Temporary service for stress_booking',
+            price=100, category='facial', is_home_service=True, duration=60,
+        )
+        # Every other worker replays its neighbour's request, like a double-click
+        users = [User.objects.create(username=f'stress_{i}') for i in range((workers + 1) // 2)]
+        failures = []
+
+        for round_number in range(rounds):
+            day = datetime.date.today() + datetime.timedelta(days=1 + round_number)
+            data = {'service': service.id, 'date': day.isoformat(), 'time': '10:00', 'address': 'Stress test'}
+            keys = [uuid.uuid4().hex for _ in users]
+            barrier = threading.Barrier(workers)
+            outcomes = []
+            threads = [
+                threading.Thread(target=self.worker, args=(barrier, users[i // 2], data, keys[i // 2], outcomes))
+                for i in range(workers)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            counts = Counter(outcome for outcome, _ in outcomes)
+            stored = Booking.objects.filter(service=service, date=day).count()
+            self.stdout.write(f'Round {round_number + 1}: {dict(counts)}, bookings stored: {stored}')
+            if stored > availability.CAPACITY or counts['created'] != stored:
+                failures.append(f'round {round_number + 1} stored {stored} bookings')
+            failures.extend(detail for outcome, detail in outcomes if outcome == 'error')
+        return failures
@@ -0,0 +1,209 @@
+"""
+Per-request instrumentation.
+
+RequestMetricsMiddleware records, for every request, the number of SQL
+queries, time spent in the database, in template rendering and in password
+hashing, plus duplicated queries (same SQL and parameters) and repeated
+statements (same SQL, different parameters: the usual N+1 signature). One
+structured log line is written per request, keyed by URL name.
+
+Staff can send ``X-Profile: 1`` (or set REQUEST_PROFILING_SAMPLE_RATE) to run
+the request under cProfile; the dump is written to REQUEST_PROFILE_DIR and
+named in the ``X-Profile-File`` response header.
+
+With REQUEST_METRICS_ENABLED and profiling both off the middleware removes
+itself at startup, so it costs nothing.
+
+The middleware is async-capable. Queries are recorded by a wrapper installed on
+every database connection that reports to the current request through a
+context variable, so ORM calls that async views push onto worker threads are
+still counted. cProfile only sees the thread it runs on, so requests served
+by async views are measured but not profiled.
+"""
+import contextvars
+import cProfile
+import json
+import logging
+import os
+import random
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.auth.hashers import get_hashers
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.base import Template
+
+logger = logging.getLogger('beauty_parlor.requests')
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+_instrumented = False
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.hash_time = 0.0
+        self.render_depth = 0
+        self.statements = Counter()
+        self.executions = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            self.statements[sql] += 1
+            self.executions[(sql, repr(params))] += 1
+
+    def summary(self):
+        duplicates = {key: count for key, count in self.executions.items() if count > 1}
+        repeated = {sql: count for sql, count in self.statements.items() if count > 1}
+        return {
+            'queries': self.queries,
+            'db_ms': round(self.db_time * 1000, 2),
+            'render_ms': round(self.render_time * 1000, 2),
+            'hash_ms': round(self.hash_time * 1000, 2),
+            'duplicate_queries': sum(count - 1 for count in duplicates.values()),
+            'repeated_statements': {sql[:200]: count for sql, count in sorted(repeated.items(), key=lambda item: -item[1])[:5]},
+        }
+
+
+def _timed(attribute, original, outermost_only=False):
+    def wrapper(*args, **kwargs):
+        metrics = _current.get()
+        if metrics is None:
+            return original(*args, **kwargs)
+        if outermost_only:
+            metrics.render_depth += 1
+            if metrics.render_depth > 1:
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    metrics.render_depth -= 1
+        started = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            setattr(metrics, attribute, getattr(metrics, attribute) + time.perf_counter() - started)
+            if outermost_only:
+                metrics.render_depth -= 1
+    return wrapper
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def _wrap_connection(connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _instrument():
+    """Wrap queries, template rendering and password hashing once per process; a no-op outside measured requests."""
+    global _instrumented
+    if _instrumented:
+        return
+    connection_created.connect(_wrap_connection)
+    for connection in connections.all(initialized_only=True):
+        _wrap_connection(connection)
+    Template.render = _timed('render_time', Template.render, outermost_only=True)
+    for hasher_class in {type(hasher) for hasher in get_hashers()}:
+        hasher_class.encode = _timed('hash_time', hasher_class.encode)
+    _instrumented = True
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        self.enabled = getattr(settings, 'REQUEST_METRICS_ENABLED', False)
+        self.sample_rate = getattr(settings, 'REQUEST_PROFILING_SAMPLE_RATE', 0.0)
+        self.profile_header = getattr(settings, 'REQUEST_PROFILING_HEADER', 'HTTP_X_PROFILE')
+        self.profile_dir = getattr(settings, 'REQUEST_PROFILE_DIR', None)
+        if not self.enabled and not self.profile_dir:
+            raise MiddlewareNotUsed
+        _instrument()
+
+    def should_profile(self, request):
+        if not self.profile_dir:
+            return False
+        if request.META.get(self.profile_header) == '1':
+            user = getattr(request, 'user', None)
+            return bool(user and user.is_staff)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        profiler = cProfile.Profile() if self.should_profile(request) else None
+        if not self.enabled and profiler is None:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - started, profiler)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - started)
+
+    def finish(self, request, response, metrics, total, profiler=None):
+        match = getattr(request, 'resolver_match', None)
+        record = {
+            'url_name': match.view_name if match else None,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 2),
+            **metrics.summary(),
+        }
+        if profiler is not None:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            filename = f"{record['url_name'] or 'unresolved'}-{int(time.time() * 1000)}.prof".replace(':', '_')
+            profiler.dump_stats(os.path.join(self.profile_dir, filename))
+            record['profile'] = filename
+            response['X-Profile-File'] = filename
+            response['Server-Timing'] = (
+                f"db;dur={record['db_ms']}, render;dur={record['render_ms']}, "
+                f"hash;dur={record['hash_ms']}, total;dur={record['total_ms']}"
+            )
+
+        logger.info(json.dumps(record))
+        return response
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 07:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beauty_parlor', '0002_remove_booking_email_remove_booking_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='service',
+            options={'ordering': ['name']},
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='booking_user_created_idx'),
+        ),
+    ]
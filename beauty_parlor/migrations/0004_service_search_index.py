@@ -0,0 +1,37 @@
+from django.db import migrations, OperationalError
+
+FTS_TABLE = 'beauty_parlor_service_fts'
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "name, description, category UNINDEXED, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+    except OperationalError:
+        # SQLite was built without FTS5; search falls back to icontains.
+        return
+    schema_editor.execute(
+        f'INSERT INTO {FTS_TABLE} (rowid, name, description, category) '
+        'SELECT id, name, description, category FROM beauty_parlor_service'
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beauty_parlor', '0003_booking_user_created_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-18 07:52
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('beauty_parlor', '0004_service_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_booking_id', models.BigIntegerField(default=0)),
+                ('users_scored', models.IntegerField(default=0)),
+                ('full_rebuild', models.BooleanField(default=False)),
+                ('finished_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ServiceSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('co_bookings', models.IntegerField(default=0, help_text='Customers who booked both services')),
+                ('score', models.FloatField(default=0)),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similarities', to='beauty_parlor.service')),
+                ('similar_service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_to', to='beauty_parlor.service')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['service', '-score'], name='similarity_service_score_idx')],
+                'unique_together': {('service', 'similar_service')},
+            },
+        ),
+        migrations.CreateModel(
+            name='RecommendationScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendation_scores', to='beauty_parlor.service')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='recommendation_scores', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-score'], name='recommendation_user_score_idx')],
+                'unique_together': {('user', 'service')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 07:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beauty_parlor', '0005_recommendations'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['service', 'date'], name='booking_service_date_idx'),
+        ),
+    ]
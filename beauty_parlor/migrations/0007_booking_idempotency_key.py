@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-18 07:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beauty_parlor', '0006_booking_service_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='idempotency_key',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.UniqueConstraint(fields=('user', 'idempotency_key'), name='booking_user_idempotency_key'),
+        ),
+    ]
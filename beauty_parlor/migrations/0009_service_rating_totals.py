@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:04
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_rating_totals(apps, schema_editor):
+    Review = apps.get_model('beauty_parlor', 'Review')
+    Service = apps.get_model('beauty_parlor', 'Service')
+    totals = Review.objects.values('booking__service_id').annotate(total=Sum('rating'), count=Count('id'))
+    for row in totals:
+        Service.objects.filter(pk=row['booking__service_id']).update(
+            rating_sum=row['total'],
+            rating_count=row['count'],
+            rating_average=row['total'] / row['count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beauty_parlor', '0008_query_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='rating_average',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_rating_totals, migrations.RunPython.noop),
+    ]
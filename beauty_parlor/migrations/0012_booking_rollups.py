@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:19
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+import django.db.models.deletion
+
+
+def backfill_rollups(apps, schema_editor):
+    Booking = apps.get_model('beauty_parlor', 'Booking')
+    BookingRollup = apps.get_model('beauty_parlor', 'BookingRollup')
+    totals = (
+        Booking.objects.values('date', 'service_id', 'service__category', 'status')
+        .annotate(count=Count('id'), revenue=Sum('total_amount')).order_by()
+    )
+    BookingRollup.objects.bulk_create(
+        (
+            BookingRollup(
+                date=row['date'], service_id=row['service_id'], category=row['service__category'],
+                status=row['status'], bookings=row['count'], revenue=row['revenue'] or 0,
+            )
+            for row in totals.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beauty_parlor', '0011_catalog_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('category', models.CharField(max_length=100)),
+                ('status', models.CharField(max_length=20)),
+                ('bookings', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='beauty_parlor.service')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='bookingrollup',
+            constraint=models.UniqueConstraint(fields=('date', 'service', 'status'), name='rollup_date_service_status'),
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beauty_parlor', '0012_booking_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Area',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('pincode', models.CharField(db_index=True, max_length=6)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+            ],
+            options={
+                'ordering': ['name'],
+                'unique_together': {('name', 'pincode')},
+            },
+        ),
+        migrations.CreateModel(
+            name='Itinerary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('zone', models.CharField(help_text='Cluster of neighbouring areas', max_length=100)),
+                ('number', models.PositiveIntegerField(help_text="Position among the day's itineraries")),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('visits', models.PositiveIntegerField(default=0)),
+                ('service_minutes', models.PositiveIntegerField(default=0)),
+                ('travel_minutes', models.PositiveIntegerField(default=0)),
+                ('planned_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name_plural': 'itineraries',
+                'ordering': ['date', 'number'],
+                'unique_together': {('date', 'number')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ItineraryStop',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField()),
+                ('travel_minutes', models.PositiveIntegerField(default=0, help_text='Estimated travel from the previous stop')),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('area', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='beauty_parlor.area')),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='itinerary_stops', to='beauty_parlor.booking')),
+                ('itinerary', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stops', to='beauty_parlor.itinerary')),
+            ],
+            options={
+                'ordering': ['itinerary', 'position'],
+                'unique_together': {('itinerary', 'position')},
+            },
+        ),
+    ]
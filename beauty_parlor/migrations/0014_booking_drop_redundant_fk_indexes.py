@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('beauty_parlor', '0013_dispatch_planner'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='booking',
+            name='service',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='beauty_parlor.service'),
+        ),
+        migrations.AlterField(
+            model_name='booking',
+            name='user',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -29,13 +30,32 @@ class Service(models.Model):
     ])
     is_home_service = models.BooleanField(default=False)
     duration = models.IntegerField(help_text='Duration in minutes', default=60)
+    # Maintained by ratings.py from Review rows; never edited directly
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_average = models.FloatField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return self.name
     
+    def save(self, *args, **kwargs):
+        # Rating totals change through atomic UPDATEs; a form save must not write back a stale copy
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in ('rating_sum', 'rating_count', 'rating_average')
+            ]
+        super().save(*args, **kwargs)
+    
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['category', 'name'], name='service_category_name_idx'),
+            # Partial: the ORM filters booleans as a bare column, which only a matching partial index can serve
+            models.Index(fields=['name'], condition=models.Q(is_home_service=True), name='service_home_name_idx'),
+        ]
 
 class Testimonial(models.Model):
     name = models.CharField(max_length=100)
@@ -44,6 +64,7 @@ class Testimonial(models.Model):
     comment = models.TextField()
     image = models.ImageField(upload_to='testimonials/', blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.name} - {self.service}"
@@ -60,8 +81,9 @@ class Contact(models.Model):
         return f"{self.name} - {self.subject}"
 
 class Booking(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='bookings', null=True, blank=True)
-    service = models.ForeignKey(Service, on_delete=models.CASCADE)
+    # No single-column indexes: booking_user_created_idx and booking_service_date_idx lead with these
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='bookings', null=True, blank=True, db_index=False)
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, db_index=False)
     date = models.DateField()
     time = models.TimeField()
     address = models.TextField()
@@ -74,12 +96,27 @@ class Booking(models.Model):
     ], default='pending')
     special_requests = models.TextField(blank=True)
     total_amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.user.username if self.user else 'Anonymous'} - {self.service.name} - {self.date}"
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='booking_user_created_idx'),
+            models.Index(fields=['service', 'date'], name='booking_service_date_idx'),
+            models.Index(fields=['user', 'status', '-created_at', '-id'], name='booking_user_status_idx'),
+            models.Index(fields=['status', 'date'], name='booking_status_date_idx'),
+            models.Index(fields=['date'], condition=models.Q(is_home_service=False), name='booking_salon_date_idx'),
+            models.Index(fields=['date', 'time'], name='booking_date_time_idx'),
+            models.Index(fields=['-created_at'], name='booking_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'idempotency_key'], name='booking_user_idempotency_key'),
+        ]
+    
     def save(self, *args, **kwargs):
         if not self.total_amount:
             self.total_amount = self.service.price
@@ -93,4 +130,145 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
-        return f"{self.user.username} - {self.booking.service.name}" 
\ No newline at end of file
+        return f"{self.user.username} - {self.booking.service.name}"
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['rating', '-created_at'], name='review_rating_created_idx'),
+            models.Index(fields=['-created_at'], name='review_created_idx'),
+        ]
+
+class BookingRollup(models.Model):
+    # One row per booking day, service and status; maintained by rollups.py
+    date = models.DateField()
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='rollups')
+    category = models.CharField(max_length=100)
+    status = models.CharField(max_length=20)
+    bookings = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    
+    def __str__(self):
+        return f"{self.date} {self.service_id} {self.status}: {self.bookings}"
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'service', 'status'], name='rollup_date_service_status'),
+        ]
+
+class Area(models.Model):
+    # Gazetteer of served localities, loaded by the load_gazetteer command
+    name = models.CharField(max_length=100)
+    pincode = models.CharField(max_length=6, db_index=True)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    
+    def __str__(self):
+        return f"{self.name} {self.pincode}"
+    
+    class Meta:
+        ordering = ['name']
+        unique_together = ['name', 'pincode']
+
+class Itinerary(models.Model):
+    # One traveller's home visits for a day, planned by dispatch.py
+    date = models.DateField()
+    zone = models.CharField(max_length=100, help_text='Cluster of neighbouring areas')
+    number = models.PositiveIntegerField(help_text='Position among the day\'s itineraries')
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    visits = models.PositiveIntegerField(default=0)
+    service_minutes = models.PositiveIntegerField(default=0)
+    travel_minutes = models.PositiveIntegerField(default=0)
+    planned_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.date} #{self.number} {self.zone}"
+    
+    class Meta:
+        ordering = ['date', 'number']
+        verbose_name_plural = 'itineraries'
+        unique_together = ['date', 'number']
+
+class ItineraryStop(models.Model):
+    itinerary = models.ForeignKey(Itinerary, on_delete=models.CASCADE, related_name='stops')
+    booking = models.ForeignKey(Booking, on_delete=models.CASCADE, related_name='itinerary_stops')
+    area = models.ForeignKey(Area, on_delete=models.SET_NULL, null=True, blank=True)
+    position = models.PositiveIntegerField()
+    travel_minutes = models.PositiveIntegerField(default=0, help_text='Estimated travel from the previous stop')
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    
+    def __str__(self):
+        return f"{self.itinerary} stop {self.position}"
+    
+    class Meta:
+        ordering = ['itinerary', 'position']
+        unique_together = ['itinerary', 'position']
+
+
+class ServiceSimilarity(models.Model):
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='similarities')
+    similar_service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='similar_to')
+    co_bookings = models.IntegerField(default=0, help_text='Customers who booked both services')
+    score = models.FloatField(default=0)
+    
+    def __str__(self):
+        return f"{self.service_id} ~ {self.similar_service_id} ({self.score:.2f})"
+    
+    class Meta:
+        unique_together = ['service', 'similar_service']
+        indexes = [
+            models.Index(fields=['service', '-score'], name='similarity_service_score_idx'),
+        ]
+
+
+class RecommendationScore(models.Model):
+    # user is empty for the site-wide, rating-weighted popularity ranking
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='recommendation_scores', null=True, blank=True)
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='recommendation_scores')
+    score = models.FloatField()
+    
+    def __str__(self):
+        return f"{self.user_id or 'popular'} - {self.service_id} ({self.score:.2f})"
+    
+    class Meta:
+        unique_together = ['user', 'service']
+        indexes = [
+            models.Index(fields=['user', '-score'], name='recommendation_user_score_idx'),
+        ]
+
+
+class RecommendationRun(models.Model):
+    last_booking_id = models.BigIntegerField(default=0)
+    users_scored = models.IntegerField(default=0)
+    full_rebuild = models.BooleanField(default=False)
+    finished_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Recommendations up to booking #{self.last_booking_id}"
+
+class Job(models.Model):
+    name = models.CharField(max_length=100, help_text='Registered task name, see jobs.py')
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=[
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"{self.name} #{self.id} ({self.status})"
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+        ]
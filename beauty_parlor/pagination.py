@@ -0,0 +1,185 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+EXACT_COUNT_LIMIT = getattr(settings, 'ADMIN_EXACT_COUNT_LIMIT', 10000)
+
+
+def _encode(values):
+    payload = json.dumps(values).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def _decode(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def encode_cursor(created_at, pk):
+    return _encode([created_at.isoformat(), pk])
+
+
+def decode_cursor(cursor):
+    """Return (created_at, id) from a cursor string, or None if it is invalid."""
+    if not cursor:
+        return None
+    try:
+        created_at, pk = _decode(cursor)
+        created_at = parse_datetime(created_at)
+        pk = int(pk)
+    except (ValueError, TypeError):
+        return None
+    if created_at is None:
+        return None
+    return created_at, pk
+
+
+def _page_queryset(queryset, cursor, page_size):
+    queryset = queryset.order_by('-created_at', '-id')
+    position = decode_cursor(cursor)
+    if position:
+        created_at, pk = position
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+    return queryset[:page_size + 1]
+
+
+def _split_page(rows, page_size):
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return rows, next_cursor
+
+
+def keyset_page(queryset, cursor=None, page_size=20):
+    """
+    Return one page of ``queryset`` walked newest first on (created_at, id).
+
+    Rows after the cursor are found with an index range scan instead of an
+    OFFSET, so every page costs the same no matter how deep the user goes.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    return _split_page(list(_page_queryset(queryset, cursor, page_size)), page_size)
+
+
+async def akeyset_page(queryset, cursor=None, page_size=20):
+    """Async keyset_page()."""
+    rows = [row async for row in _page_queryset(queryset, cursor, page_size)]
+    return _split_page(rows, page_size)
+
+
+def ordered_page(queryset, field, cursor=None, page_size=20):
+    """
+    keyset_page() for an ascending (``field``, id) order, such as services by
+    name. Returns (rows, next_cursor).
+    """
+    queryset = queryset.order_by(field, 'id')
+    position = None
+    if cursor:
+        try:
+            value, pk = _decode(cursor)
+            position = str(value), int(pk)
+        except (ValueError, TypeError):
+            position = None
+    if position:
+        value, pk = position
+        queryset = queryset.filter(Q(**{f'{field}__gt': value}) | Q(**{field: value, 'id__gt': pk}))
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = _encode([getattr(rows[-1], field), rows[-1].id])
+    return rows, next_cursor
+
+
+def ranked_page(queryset, ids, cursor=None, page_size=20):
+    """
+    Page through ``ids``, an already ranked and capped list such as search
+    hits, loading only the current page's rows. Returns (rows, next_cursor).
+    """
+    start = 0
+    if cursor:
+        try:
+            start = max(int(_decode(cursor)[0]), 0)
+        except (ValueError, TypeError, IndexError):
+            start = 0
+    page_ids = ids[start:start + page_size]
+    by_id = queryset.in_bulk(page_ids)
+    rows = [by_id[pk] for pk in page_ids if pk in by_id]
+    next_cursor = _encode([start + page_size]) if len(ids) > start + page_size else None
+    return rows, next_cursor
+
+
+def estimated_count(model, using='default'):
+    """The table's row count from database statistics, without scanning it. None if unknown."""
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [table])
+        elif connection.vendor == 'mysql':
+            cursor.execute(
+                'SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s',
+                [table],
+            )
+        elif connection.vendor == 'sqlite':
+            # The largest rowid is one b-tree descent; it over-counts only by rows deleted since
+            cursor.execute(f'SELECT MAX(rowid) FROM {connection.ops.quote_name(table)}')
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for admin changelists of big tables. Without filters it uses
+    estimated_count() once the table has more than ADMIN_EXACT_COUNT_LIMIT
+    rows; filtered lists still get an exact (index-assisted) COUNT.
+
+    An estimate can overshoot (SQLite's MAX(rowid) still counts deleted
+    rows), so a page that comes back short pins the count to the rows that
+    really exist, and a page past the real end shows the last one instead.
+    """
+    estimated = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if hasattr(queryset, 'query') and not queryset.query.has_filters():
+            estimate = estimated_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > EXACT_COUNT_LIMIT:
+                self.estimated = True
+                return estimate
+        return super().count
+
+    def _pin_count(self, count):
+        self.__dict__['count'] = count
+        self.__dict__.pop('num_pages', None)
+        self.estimated = False
+
+    def page(self, number):
+        page = super().page(number)
+        if not self.estimated:
+            return page
+        # len() runs the page's query and keeps the rows on the (still lazy-looking) queryset
+        rows = len(page.object_list)
+        if rows == self.per_page:
+            return page
+        if rows:
+            self._pin_count((page.number - 1) * self.per_page + rows)
+            return page
+        # Past the real end: only here is an exact COUNT worth paying for
+        self._pin_count(Paginator.count.func(self))
+        return super().page(min(page.number, self.num_pages))
@@ -0,0 +1,86 @@
+"""
+Stored rating totals on Service.
+
+Every Review adds its rating to its service's ``rating_sum`` and
+``rating_count``. Changes are applied with a single UPDATE using F()
+expressions, so concurrent reviews never lose an increment, and
+``rating_average`` is recomputed in the same statement. ``reconcile()``
+recomputes the totals from the Review table to repair drift left by bulk
+imports or raw SQL.
+"""
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
+
+from . import catalog_cache
+from .models import Review, Service
+
+
+def _average(rating_sum, rating_count):
+    return Coalesce(Cast(rating_sum, FloatField()) / NullIf(rating_count, 0), Value(0.0))
+
+
+def apply(service_id, sum_delta, count_delta):
+    """Add ``sum_delta``/``count_delta`` to one service's totals."""
+    rating_sum = F('rating_sum') + sum_delta
+    rating_count = F('rating_count') + count_delta
+    Service.objects.filter(pk=service_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating_average=_average(rating_sum, rating_count),
+        updated_at=timezone.now(),
+    )
+    # .update() sends no signals, and cached catalog pages show the average
+    transaction.on_commit(lambda: catalog_cache.bump(Service))
+
+
+def review_changed(review, previous=None):
+    """
+    Apply a created or edited review. ``previous`` is the (rating, service_id)
+    stored before the edit, or None for a new review.
+    """
+    service_id = review.booking.service_id
+    with transaction.atomic():
+        if previous is None:
+            apply(service_id, review.rating, 1)
+        elif previous[1] == service_id:
+            if previous[0] != review.rating:
+                apply(service_id, review.rating - previous[0], 0)
+        else:
+            apply(previous[1], -previous[0], -1)
+            apply(service_id, review.rating, 1)
+
+
+def review_deleted(rating, service_id):
+    apply(service_id, -rating, -1)
+
+
+def reconcile(dry_run=False):
+    """
+    Recompute every service's totals from its reviews. Returns
+    ``[(service, (stored_sum, stored_count), (actual_sum, actual_count))]``
+    for the services that had drifted.
+    """
+    actual = {
+        row['booking__service_id']: (row['total'], row['count'])
+        for row in Review.objects.values('booking__service_id').annotate(total=Sum('rating'), count=Count('id'))
+    }
+    drifted = []
+    with transaction.atomic():
+        for service in Service.objects.select_for_update().order_by('id'):
+            stored = (service.rating_sum, service.rating_count)
+            expected = actual.get(service.id, (0, 0))
+            if stored == expected:
+                continue
+            drifted.append((service, stored, expected))
+            if not dry_run:
+                Service.objects.filter(pk=service.pk).update(
+                    rating_sum=expected[0],
+                    rating_count=expected[1],
+                    rating_average=expected[0] / expected[1] if expected[1] else 0.0,
+                    updated_at=timezone.now(),
+                )
+    if drifted and not dry_run:
+        catalog_cache.bump(Service)
+    return drifted
@@ -0,0 +1,260 @@
+"""
+Batch recommendation engine.
+
+Scores are computed offline by the ``refresh_recommendations`` command and
+stored in RecommendationScore / ServiceSimilarity, so views only do an indexed
+read. Three signals are blended per user:
+
+* co-booking: cosine similarity between services from the user x service
+  booking matrix (customers who booked X also booked Y),
+* category affinity: the share of a user's bookings in each category,
+* popularity: distinct customers weighted by a Bayesian average of the
+  stored service rating totals.
+
+The service x service co-booking counts are kept in ServiceSimilarity so an
+incremental run only has to fold in the users who booked since the last run.
+"""
+import math
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Case, IntegerField, Max, OuterRef, Subquery, Value, When
+
+from .models import Booking, RecommendationRun, RecommendationScore, Service, ServiceSimilarity
+
+USER_CHUNK_SIZE = 900  # stays under SQLite's bound-parameter limit
+TOP_N = 12
+RATING_PRIOR_WEIGHT = 5
+
+CO_BOOKING_WEIGHT = 0.5
+AFFINITY_WEIGHT = 0.3
+POPULARITY_WEIGHT = 0.2
+
+
+class Catalog:
+    """Dense index over the current services: position <-> id, plus a category one-hot matrix."""
+
+    def __init__(self):
+        rows = list(Service.objects.order_by('id').values_list('id', 'category'))
+        self.ids = np.array([pk for pk, _ in rows], dtype=np.int64)
+        self.position = {pk: i for i, (pk, _) in enumerate(rows)}
+        categories = sorted({category for _, category in rows})
+        category_index = {category: i for i, category in enumerate(categories)}
+        self.categories = np.zeros((len(rows), len(categories)), dtype=np.float32)
+        for i, (_, category) in enumerate(rows):
+            self.categories[i, category_index[category]] = 1
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def _chunks(items, size=USER_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _booking_matrices(catalog, user_ids, watermark, previous_watermark):
+    """
+    Binary user x service matrices for ``user_ids``: bookings up to ``watermark``
+    and bookings up to ``previous_watermark`` (what the last run already saw).
+    """
+    row = {user_id: i for i, user_id in enumerate(user_ids)}
+    current = np.zeros((len(user_ids), len(catalog)), dtype=np.float32)
+    previous = np.zeros_like(current)
+    bookings = Booking.objects.filter(user_id__in=user_ids, id__lte=watermark).values_list('id', 'user_id', 'service_id')
+    for booking_id, user_id, service_id in bookings.iterator(chunk_size=5000):
+        col = catalog.position.get(service_id)
+        if col is None:
+            continue
+        current[row[user_id], col] = 1
+        if booking_id <= previous_watermark:
+            previous[row[user_id], col] = 1
+    return current, previous
+
+
+def _load_co_bookings(catalog):
+    matrix = np.zeros((len(catalog), len(catalog)), dtype=np.float64)
+    for service_id, similar_id, count in ServiceSimilarity.objects.values_list('service_id', 'similar_service_id', 'co_bookings'):
+        i, j = catalog.position.get(service_id), catalog.position.get(similar_id)
+        if i is not None and j is not None:
+            matrix[i, j] = count
+    return matrix
+
+
+def _cosine(co_bookings):
+    customers = np.sqrt(np.diag(co_bookings))
+    denominator = np.outer(customers, customers)
+    similarity = np.divide(co_bookings, denominator, out=np.zeros_like(co_bookings), where=denominator > 0)
+    np.fill_diagonal(similarity, 0)
+    return similarity
+
+
+def _popularity(catalog, co_bookings):
+    customers = np.diag(co_bookings)
+    rating_sum = np.zeros(len(catalog))
+    rating_count = np.zeros(len(catalog))
+    for service_id, total, count in Service.objects.values_list('id', 'rating_sum', 'rating_count'):
+        col = catalog.position.get(service_id)
+        if col is not None:
+            rating_sum[col] = total
+            rating_count[col] = count
+
+    overall = rating_sum.sum() / rating_count.sum() if rating_count.sum() else 4.0
+    rating = (rating_sum + RATING_PRIOR_WEIGHT * overall) / (rating_count + RATING_PRIOR_WEIGHT)
+    reach = np.log1p(customers) / math.log1p(customers.max()) if customers.max() else np.zeros(len(catalog))
+    return reach * rating / 5
+
+
+def _score_users(catalog, booked, similarity, popularity):
+    """Blend the three signals for a block of users; already-booked services are excluded."""
+    co_booking = booked @ similarity
+    peak = co_booking.max(axis=1, keepdims=True)
+    co_booking = np.divide(co_booking, peak, out=np.zeros_like(co_booking), where=peak > 0)
+
+    per_category = booked @ catalog.categories
+    totals = per_category.sum(axis=1, keepdims=True)
+    per_category = np.divide(per_category, totals, out=np.zeros_like(per_category), where=totals > 0)
+    affinity = per_category @ catalog.categories.T
+
+    scores = CO_BOOKING_WEIGHT * co_booking + AFFINITY_WEIGHT * affinity + POPULARITY_WEIGHT * popularity
+    scores[booked > 0] = -np.inf
+    return scores
+
+
+def _top_n(scores, n=TOP_N):
+    n = min(n, scores.shape[1])
+    top = np.argpartition(-scores, n - 1, axis=1)[:, :n]
+    return top, np.take_along_axis(scores, top, axis=1)
+
+
+def _save_user_scores(catalog, user_ids, scores):
+    top, values = _top_n(scores)
+    rows = [
+        RecommendationScore(user_id=user_id, service_id=int(catalog.ids[col]), score=float(value))
+        for user_id, cols, user_values in zip(user_ids, top, values)
+        for col, value in zip(cols, user_values)
+        if np.isfinite(value)
+    ]
+    RecommendationScore.objects.filter(user_id__in=user_ids).delete()
+    RecommendationScore.objects.bulk_create(rows, batch_size=1000)
+
+
+def _save_similarity(catalog, co_bookings, similarity):
+    rows = [
+        ServiceSimilarity(
+            service_id=int(catalog.ids[i]),
+            similar_service_id=int(catalog.ids[j]),
+            co_bookings=int(co_bookings[i, j]),
+            score=float(similarity[i, j]),
+        )
+        for i, j in zip(*np.nonzero(co_bookings))
+    ]
+    ServiceSimilarity.objects.all().delete()
+    ServiceSimilarity.objects.bulk_create(rows, batch_size=1000)
+
+
+def _save_popularity(catalog, popularity):
+    RecommendationScore.objects.filter(user__isnull=True).delete()
+    RecommendationScore.objects.bulk_create(
+        [RecommendationScore(user=None, service_id=int(pk), score=float(score)) for pk, score in zip(catalog.ids, popularity)],
+        batch_size=1000,
+    )
+
+
+def refresh(full=False):
+    """
+    Fold bookings created since the last run into the stored scores.
+
+    Only users with new bookings are rescored; ``full=True`` rebuilds the
+    co-booking counts and every user's scores from scratch. Returns the
+    RecommendationRun that records the new watermark.
+    """
+    last_run = RecommendationRun.objects.order_by('-id').first()
+    previous_watermark = 0 if full or last_run is None else last_run.last_booking_id
+    watermark = Booking.objects.aggregate(top=Max('id'))['top'] or 0
+
+    catalog = Catalog()
+    if not len(catalog):
+        return RecommendationRun.objects.create(last_booking_id=watermark, full_rebuild=full)
+
+    new_bookings = Booking.objects.filter(user__isnull=False, id__gt=previous_watermark, id__lte=watermark)
+    user_ids = sorted(set(new_bookings.values_list('user_id', flat=True)))
+
+    # Pass 1: update the co-booking counts with each affected user's change.
+    co_bookings = np.zeros((len(catalog), len(catalog))) if full else _load_co_bookings(catalog)
+    for chunk in _chunks(user_ids):
+        current, previous = _booking_matrices(catalog, chunk, watermark, previous_watermark)
+        co_bookings += current.T @ current - previous.T @ previous
+
+    similarity = _cosine(co_bookings)
+    popularity = _popularity(catalog, co_bookings)
+
+    # Pass 2: rescore the affected users against the updated similarities.
+    with transaction.atomic():
+        _save_similarity(catalog, co_bookings, similarity)
+        _save_popularity(catalog, popularity)
+        if full:
+            RecommendationScore.objects.filter(user__isnull=False).delete()
+        for chunk in _chunks(user_ids):
+            current, _ = _booking_matrices(catalog, chunk, watermark, previous_watermark)
+            _save_user_scores(catalog, chunk, _score_users(catalog, current, similarity, popularity))
+        return RecommendationRun.objects.create(
+            last_booking_id=watermark, users_scored=len(user_ids), full_rebuild=full,
+        )
+
+
+def recommended_services(user=None, service=None):
+    """
+    Services ordered by precomputed score: those often booked together with
+    ``service`` if given, otherwise personalised for ``user``, otherwise the
+    popularity ranking. Each is a single indexed query.
+
+    A service with no similarity rows yet (new, or added since the last
+    refresh) gets the rest of its category, then the rest of the catalogue,
+    each by popularity.
+    """
+    if service is not None:
+        similar = _similar(service)
+        return similar if similar.exists() else _related(service)
+    if user is not None and user.is_authenticated:
+        personal = _personal(user)
+        if personal.exists():
+            return personal
+    return _popular()
+
+
+async def arecommended_services(user=None, service=None):
+    """Async recommended_services()."""
+    if service is not None:
+        similar = _similar(service)
+        return similar if await similar.aexists() else _related(service)
+    if user is not None and user.is_authenticated:
+        personal = _personal(user)
+        if await personal.aexists():
+            return personal
+    return _popular()
+
+
+def _similar(service):
+    return Service.objects.filter(
+        similar_to__service=service, similar_to__score__gt=0,
+    ).order_by('-similar_to__score')
+
+
+def _related(service):
+    popularity = RecommendationScore.objects.filter(
+        user__isnull=True, service=OuterRef('pk'),
+    ).values('score')[:1]
+    return Service.objects.exclude(pk=service.pk).order_by(
+        Case(When(category=service.category, then=Value(0)), default=Value(1), output_field=IntegerField()),
+        Subquery(popularity).desc(nulls_last=True),
+        'name',
+    )
+
+
+def _personal(user):
+    return Service.objects.filter(recommendation_scores__user=user).order_by('-recommendation_scores__score')
+
+
+def _popular():
+    return Service.objects.filter(recommendation_scores__user__isnull=True).order_by('-recommendation_scores__score')
@@ -0,0 +1,148 @@
+"""
+Daily booking rollups for the staff dashboard.
+
+BookingRollup holds one row per booking day (``Booking.date``), service and
+status, with the booking count and the ``total_amount`` sum. Saving or
+deleting a booking moves it between rows with single-statement F() updates,
+the same way ratings.py keeps review totals, so the dashboard never scans the
+Booking table. ``rebuild()`` recomputes a date range from scratch after bulk
+imports or raw SQL.
+"""
+import datetime
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+
+from .models import Booking, BookingRollup, Service
+
+# Statuses whose total_amount counts as revenue on the dashboard
+REVENUE_STATUSES = ('confirmed', 'completed')
+
+
+def _key(booking):
+    return booking.date, booking.service_id, booking.status, booking.total_amount or Decimal('0')
+
+
+def _add(day, service_id, status, count, amount):
+    rows = BookingRollup.objects.filter(date=day, service_id=service_id, status=status)
+    if rows.update(bookings=F('bookings') + count, revenue=F('revenue') + amount) or count <= 0:
+        # Never create a row to subtract from: the service may be going away in the same cascade
+        return
+    category = Service.objects.filter(pk=service_id).values_list('category', flat=True).first()
+    try:
+        with transaction.atomic():
+            BookingRollup.objects.create(
+                date=day, service_id=service_id, category=category or '', status=status,
+                bookings=count, revenue=amount,
+            )
+    except IntegrityError:
+        # Another booking for the same row created it first
+        rows.update(bookings=F('bookings') + count, revenue=F('revenue') + amount)
+
+
+def previous_key(booking):
+    """The stored (date, service, status, amount) of a booking about to be saved, or None if it is new."""
+    if not booking.pk:
+        return None
+    row = Booking.objects.filter(pk=booking.pk).values_list('date', 'service_id', 'status', 'total_amount').first()
+    return row and (*row[:3], row[3] or Decimal('0'))
+
+
+def booking_changed(booking, previous=None):
+    """Apply a created or edited booking. ``previous`` comes from previous_key()."""
+    current = _key(booking)
+    if previous == current:
+        return
+    with transaction.atomic():
+        if previous is not None:
+            _add(*previous[:3], -1, -previous[3])
+        _add(*current[:3], 1, current[3])
+
+
+def booking_deleted(booking):
+    day, service_id, status, amount = _key(booking)
+    _add(day, service_id, status, -1, -amount)
+
+
+def bookings_moved(groups, status):
+    """
+    Apply a bulk status change made with one UPDATE. ``groups`` are the moved
+    bookings grouped as {date, service_id, status, count, revenue}.
+    """
+    with transaction.atomic():
+        for group in groups:
+            revenue = group['revenue'] or Decimal('0')
+            _add(group['date'], group['service_id'], group['status'], -group['count'], -revenue)
+            _add(group['date'], group['service_id'], status, group['count'], revenue)
+
+
+def service_changed(service):
+    """Keep the denormalized category in step when a service moves category."""
+    BookingRollup.objects.filter(service=service).exclude(category=service.category).update(category=service.category)
+
+
+def rebuild(since=None, until=None):
+    """Recompute the rollups for bookings dated ``since``..``until`` (both optional). Returns the row count."""
+    bookings = Booking.objects.all()
+    rollups = BookingRollup.objects.all()
+    if since:
+        bookings, rollups = bookings.filter(date__gte=since), rollups.filter(date__gte=since)
+    if until:
+        bookings, rollups = bookings.filter(date__lte=until), rollups.filter(date__lte=until)
+    totals = (
+        bookings.values('date', 'service_id', 'service__category', 'status')
+        .annotate(count=Count('id'), revenue=Sum('total_amount')).order_by()
+    )
+    with transaction.atomic():
+        rollups.delete()
+        created = BookingRollup.objects.bulk_create(
+            [
+                BookingRollup(
+                    date=row['date'], service_id=row['service_id'], category=row['service__category'],
+                    status=row['status'], bookings=row['count'], revenue=row['revenue'] or 0,
+                )
+                for row in totals.iterator()
+            ],
+            batch_size=1000,
+        )
+    return len(created)
+
+
+def _with_share(rows, field):
+    """Add each row's ``share`` of the largest ``field`` value, in percent, for bar widths."""
+    largest = max((row[field] for row in rows), default=0) or 1
+    for row in rows:
+        row['share'] = round(100 * row[field] / largest, 1)
+    return rows
+
+
+def summary(start, end):
+    """Dashboard figures for bookings dated ``start``..``end``, read from the rollups only."""
+    rows = BookingRollup.objects.filter(date__range=(start, end))
+    earning = rows.filter(status__in=REVENUE_STATUSES)
+
+    daily = {
+        row['date']: row
+        for row in earning.values('date').annotate(revenue=Sum('revenue'), bookings=Sum('bookings')).order_by()
+    }
+    by_day = [
+        daily.get(day, {'date': day, 'revenue': Decimal('0'), 'bookings': 0})
+        for day in (start + datetime.timedelta(days=offset) for offset in range((end - start).days + 1))
+    ]
+    by_category = list(
+        earning.values('category').annotate(revenue=Sum('revenue'), bookings=Sum('bookings')).order_by('-revenue')
+    )
+    by_status = list(rows.values('status').annotate(bookings=Sum('bookings')).order_by('-bookings'))
+    top_services = list(
+        earning.values('service_id', 'service__name')
+        .annotate(revenue=Sum('revenue'), bookings=Sum('bookings')).order_by('-revenue')[:10]
+    )
+    return {
+        'revenue': sum(row['revenue'] for row in by_day),
+        'bookings': sum(row['bookings'] for row in by_status),
+        'by_day': _with_share(by_day, 'revenue'),
+        'by_category': _with_share(by_category, 'revenue'),
+        'by_status': _with_share(by_status, 'bookings'),
+        'top_services': _with_share(top_services, 'revenue'),
+    }
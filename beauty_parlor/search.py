@@ -0,0 +1,103 @@
+"""
+Full-text search over the service catalog.
+
+On SQLite the catalog is mirrored into an FTS5 table (``beauty_parlor_service_fts``)
+that is kept in sync from the Service save/delete signals. Other databases, or
+SQLite builds without FTS5, fall back to the old icontains filter.
+"""
+import re
+
+from django.db import connection, OperationalError
+from django.db.models import Case, IntegerField, Q, When
+
+FTS_TABLE = 'beauty_parlor_service_fts'
+MAX_RESULTS = 500
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_fts_available = None
+
+
+def fts_available():
+    global _fts_available
+    if _fts_available is None:
+        _fts_available = (
+            connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _fts_available
+
+
+def build_match_query(text):
+    """Turn free text into an FTS5 query: every word must match, as a prefix."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def ranked_service_ids(text, category=None, limit=MAX_RESULTS):
+    """Return service ids matching ``text``, best match first (name hits weigh more)."""
+    match = build_match_query(text)
+    if not match:
+        return []
+    sql = f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+    params = [match]
+    if category:
+        sql += ' AND category = %s'
+        params.append(category)
+    sql += f' ORDER BY bm25({FTS_TABLE}, 10.0, 1.0) LIMIT %s'
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_services(queryset, text, category=None):
+    """
+    Filter a Service queryset down to rows matching ``text``, ordered by rank.
+    """
+    if not fts_available():
+        if category:
+            queryset = queryset.filter(category=category)
+        return queryset.filter(Q(name__icontains=text) | Q(description__icontains=text))
+
+    try:
+        ids = ranked_service_ids(text, category)
+    except OperationalError:
+        return queryset.none()
+    ranking = Case(
+        *[When(id=pk, then=position) for position, pk in enumerate(ids)],
+        output_field=IntegerField(),
+    )
+    return queryset.filter(id__in=ids).order_by(ranking) if ids else queryset.none()
+
+
+def index_service(service):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [service.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description, category) VALUES (%s, %s, %s, %s)',
+            [service.pk, service.name, service.description, service.category],
+        )
+
+
+def remove_service(service_id):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [service_id])
+
+
+def rebuild_index():
+    """Repopulate the FTS table from the Service table. Returns the row count."""
+    if not fts_available():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description, category) '
+            'SELECT id, name, description, category FROM beauty_parlor_service'
+        )
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f'SELECT count(*) FROM {FTS_TABLE}')
+        return cursor.fetchone()[0]
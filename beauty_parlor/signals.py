@@ -0,0 +1,114 @@
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from . import auth_cache, availability, catalog_cache, images, ratings, rollups, search
+from .models import Booking, Review, Service, Testimonial, UserProfile
+
+IMAGE_FIELDS = {Service: 'image', Testimonial: 'image', UserProfile: 'profile_picture'}
+
+
+@receiver(post_save, sender=Service)
+def index_service(sender, instance, **kwargs):
+    search.index_service(instance)
+
+
+@receiver(post_delete, sender=Service)
+def unindex_service(sender, instance, **kwargs):
+    search.remove_service(instance.pk)
+
+
+@receiver(post_migrate)
+def reset_search_backend(sender, **kwargs):
+    search._fts_available = None
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def invalidate_availability(sender, instance, **kwargs):
+    availability.invalidate(instance.service, instance.date)
+
+
+@receiver(pre_save, sender=Booking)
+def note_previous_rollup(sender, instance, **kwargs):
+    instance._previous_rollup = rollups.previous_key(instance)
+
+
+@receiver(post_save, sender=Booking)
+def update_rollups(sender, instance, created, **kwargs):
+    rollups.booking_changed(instance, None if created else getattr(instance, '_previous_rollup', None))
+
+
+@receiver(post_delete, sender=Booking)
+def remove_from_rollups(sender, instance, **kwargs):
+    rollups.booking_deleted(instance)
+
+
+@receiver(post_save, sender=Service)
+def update_rollup_category(sender, instance, created, **kwargs):
+    if not created:
+        rollups.service_changed(instance)
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=Testimonial)
+@receiver(post_delete, sender=Testimonial)
+def invalidate_catalog_cache(sender, **kwargs):
+    catalog_cache.bump(sender)
+
+
+@receiver(pre_save, sender=Service)
+@receiver(pre_save, sender=Testimonial)
+@receiver(pre_save, sender=UserProfile)
+def note_new_upload(sender, instance, **kwargs):
+    # The upload is only written to storage during save, so remember it for post_save
+    fieldfile = getattr(instance, IMAGE_FIELDS[sender])
+    instance._new_image_upload = bool(fieldfile) and not fieldfile._committed
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_save, sender=Testimonial)
+@receiver(post_save, sender=UserProfile)
+def generate_image_variants(sender, instance, **kwargs):
+    if getattr(instance, '_new_image_upload', False):
+        fieldfile = getattr(instance, IMAGE_FIELDS[sender])
+        images.generate_variants(fieldfile.storage, fieldfile.name)
+
+
+@receiver(pre_save, sender=Review)
+def note_previous_rating(sender, instance, **kwargs):
+    instance._previous_rating = None
+    if instance.pk:
+        instance._previous_rating = (
+            Review.objects.filter(pk=instance.pk).values_list('rating', 'booking__service_id').first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def update_rating_totals(sender, instance, created, **kwargs):
+    ratings.review_changed(instance, None if created else getattr(instance, '_previous_rating', None))
+
+
+@receiver(post_delete, sender=Review)
+def remove_from_rating_totals(sender, instance, **kwargs):
+    ratings.review_deleted(instance.rating, instance.booking.service_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    auth_cache.invalidate_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def forget_logged_out_user(sender, request, user, **kwargs):
+    if user is not None:
+        auth_cache.invalidate_user(user.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    auth_cache.invalidate_profile(instance.user_id)
@@ -0,0 +1,85 @@
+"""
+Background tasks run by the ``run_jobs`` worker; see jobs.py.
+"""
+import datetime
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.auth.tokens import default_token_generator
+from django.core.mail import EmailMessage, EmailMultiAlternatives
+from django.template.loader import render_to_string
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from . import dispatch
+from .jobs import task
+from .models import Booking, Contact
+
+
+@task('send_email', mail=True)
+def send_email(payload):
+    """Already rendered mail."""
+    message = EmailMultiAlternatives(
+        payload['subject'],
+        payload['body'],
+        payload.get('from_email') or settings.DEFAULT_FROM_EMAIL,
+        payload['to'],
+    )
+    if payload.get('html_body'):
+        message.attach_alternative(payload['html_body'], 'text/html')
+    return message
+
+
+@task('password_reset_email', mail=True)
+def password_reset_email(payload):
+    """The reset link is made here, so it only ever exists in the sent mail."""
+    user = User.objects.filter(pk=payload['user_id'], is_active=True).first()
+    if user is None:
+        return None
+    context = {
+        **payload['context'],
+        'user': user,
+        'uid': urlsafe_base64_encode(force_bytes(user.pk)),
+        'token': default_token_generator.make_token(user),
+    }
+    message = EmailMultiAlternatives(
+        ''.join(render_to_string(payload['subject_template'], context).splitlines()),
+        render_to_string(payload['email_template'], context),
+        payload.get('from_email') or settings.DEFAULT_FROM_EMAIL,
+        payload['to'],
+    )
+    if payload.get('html_email_template'):
+        message.attach_alternative(render_to_string(payload['html_email_template'], context), 'text/html')
+    return message
+
+
+@task('booking_confirmation', mail=True)
+def booking_confirmation(payload):
+    booking = Booking.objects.select_related('user', 'service').filter(pk=payload['booking_id']).first()
+    if booking is None or not booking.user or not booking.user.email:
+        return None
+    return EmailMessage(
+        f'Booking received - {booking.service.name} on {booking.date:%d %b %Y}',
+        render_to_string('emails/booking_confirmation.txt', {'booking': booking}),
+        settings.DEFAULT_FROM_EMAIL,
+        [booking.user.email],
+    )
+
+
+@task('contact_received', mail=True)
+def contact_received(payload):
+    contact = Contact.objects.filter(pk=payload['contact_id']).first()
+    if contact is None:
+        return None
+    return EmailMessage(
+        f'We received your message: {contact.subject}',
+        render_to_string('emails/contact_received.txt', {'contact': contact}),
+        settings.DEFAULT_FROM_EMAIL,
+        [contact.email],
+        bcc=[email for _, email in settings.ADMINS],
+    )
+
+
+@task('plan_dispatch')
+def plan_dispatch(payload):
+    """Re-plan one day's home-visit itineraries, e.g. after late bookings."""
+    dispatch.plan_day(datetime.date.fromisoformat(payload['date']))
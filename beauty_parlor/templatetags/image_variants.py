@@ -0,0 +1,29 @@
+from django import template
+from django.utils.html import format_html
+
+from beauty_parlor import images
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(fieldfile, alt='', css_class='', sizes='100vw', style='', loading='lazy'):
+    """
+    Render ``fieldfile`` as a <picture> with WebP and original-format srcsets.
+    Falls back to a plain <img> until variants have been generated.
+    """
+    if not fieldfile:
+        return ''
+    if not images.has_variants(fieldfile):
+        return format_html(
+            '<img src="{}" class="{}" alt="{}" style="{}" loading="{}">',
+            fieldfile.url, css_class, alt, style, loading,
+        )
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" class="{}" alt="{}" style="{}" loading="{}">'
+        '</picture>',
+        images.srcset(fieldfile, '.webp'), sizes,
+        fieldfile.url, images.srcset(fieldfile), sizes, css_class, alt, style, loading,
+    )
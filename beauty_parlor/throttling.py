@@ -0,0 +1,136 @@
+"""
+Token-bucket throttling for the POST endpoints bots like to hammer.
+
+THROTTLE_RATES maps a URL name to its buckets, e.g.::
+
+    'login': {'ip': '20/5m', 'username': '5/5m'}
+
+Each bucket holds up to N tokens and refills at N per period; every POST takes
+one token from each of the view's buckets. The ``ip`` bucket is keyed by the
+client address, ``user`` by the logged-in user's id, and any other name by
+that POST field's value (the account being logged into, the email sending a
+contact message). A bucket whose key is missing is skipped.
+
+ThrottleMiddleware checks the buckets in process_view, before the view runs,
+so a rejected request costs one cache read and never reaches the password
+hasher or the database. It answers 429 with Retry-After. Buckets live in the
+THROTTLE_CACHE cache, which must be shared by all workers (not locmem; check
+beauty_parlor.W001 warns) for the limits to hold across processes. The
+read-modify-write isn't atomic, so concurrent requests can occasionally get a
+token or two more than the rate.
+THROTTLE_RATES is read per request, so override_settings (e.g. in the
+benchmarks) takes effect.
+"""
+import math
+import re
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, JsonResponse
+from django.utils.deprecation import MiddlewareMixin
+
+CACHE_ALIAS = getattr(settings, 'THROTTLE_CACHE', 'default')
+CLIENT_IP_HEADER = getattr(settings, 'THROTTLE_CLIENT_IP_HEADER', None)
+
+_RATE = re.compile(r'^(\d+)/(\d*)([smhd])$')
+_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def rates():
+    return getattr(settings, 'THROTTLE_RATES', {})
+
+
+def parse_rate(rate):
+    """'5/10m' -> (5 tokens, 600 seconds to refill them all)."""
+    match = _RATE.match(rate.replace(' ', ''))
+    if not match:
+        raise ValueError(f'Bad throttle rate {rate!r}; use e.g. "10/m" or "5/15m"')
+    tokens, count, unit = match.groups()
+    return int(tokens), int(count or 1) * _UNITS[unit]
+
+
+def client_ip(request):
+    if CLIENT_IP_HEADER and request.META.get(CLIENT_IP_HEADER):
+        # The last address is the one our own proxy appended; earlier ones are client-supplied
+        return request.META[CLIENT_IP_HEADER].split(',')[-1].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _identity(request, scope):
+    if scope == 'ip':
+        return client_ip(request)
+    if scope == 'user':
+        return str(request.user.pk) if request.user.is_authenticated else ''
+    return request.POST.get(scope, '').strip().lower()[:200]
+
+
+class Bucket:
+    def __init__(self, key, capacity, period):
+        self.key = key
+        self.capacity = capacity
+        self.rate = capacity / period  # tokens per second
+        self.period = period
+
+    def take(self, state, now):
+        """(allowed, new state, seconds until a token is available)."""
+        tokens, updated = state if state else (self.capacity, now)
+        tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            return True, (tokens - 1, now), 0
+        return False, (tokens, now), math.ceil((1 - tokens) / self.rate)
+
+
+def buckets(request, url_name):
+    result = []
+    for scope, rate in rates().get(url_name, {}).items():
+        identity = _identity(request, scope)
+        if identity:
+            capacity, period = parse_rate(rate)
+            result.append(Bucket(f'throttle:{url_name}:{scope}:{identity}', capacity, period))
+    return result
+
+
+def check(request, url_name):
+    """Take a token from each of the view's buckets. Returns seconds to wait, or 0 if allowed."""
+    found = buckets(request, url_name)
+    if not found:
+        return 0
+    cache = caches[CACHE_ALIAS]
+    now = time.time()
+    states = cache.get_many([bucket.key for bucket in found])
+    updates, wait = {}, 0
+    for bucket in found:
+        allowed, state, retry_after = bucket.take(states.get(bucket.key), now)
+        updates[bucket.key] = state
+        if not allowed:
+            wait = max(wait, retry_after)
+    if wait:
+        # Rejected: keep the tokens, so a blocked client can't also drain an account's bucket
+        return wait
+    for bucket in found:
+        cache.set(bucket.key, updates[bucket.key], bucket.period)
+    return 0
+
+
+def too_many_requests(request, retry_after):
+    message = f'Too many requests. Try again in {retry_after} seconds.'
+    if request.resolver_match.url_name.startswith('api_'):
+        response = JsonResponse({'error': message}, status=429)
+    else:
+        response = HttpResponse(message, status=429, content_type='text/plain; charset=utf-8')
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+class ThrottleMiddleware(MiddlewareMixin):
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method != 'POST' or request.resolver_match is None:
+            return None
+        url_name = request.resolver_match.url_name
+        if url_name not in rates():
+            return None
+        retry_after = check(request, url_name)
+        if retry_after:
+            return too_many_requests(request, retry_after)
+        return None
@@ -1,29 +1,37 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, async_views, views
+from .forms import QueuedPasswordResetForm
 from django.contrib.auth import views as auth_views   # ✅ Add this import
 
+# Under ASGI the read-heavy pages are served by their async versions
+read_views = async_views if settings.ASYNC_READ_VIEWS else views
+
 urlpatterns = [
-    path('', views.home, name='home'),
+    path('', read_views.home, name='home'),
     path('about/', views.about, name='about'),
-    path('services/', views.services, name='services'),
-    path('service/<int:service_id>/', views.service_detail, name='service_detail'),
+    path('services/', read_views.services, name='services'),
+    path('service/<int:service_id>/', read_views.service_detail, name='service_detail'),
     path('contact/', views.contact, name='contact'),
     path('booking/', views.booking, name='booking'),
-    path('testimonials/', views.testimonials, name='testimonials'),
+    path('testimonials/', read_views.testimonials, name='testimonials'),
 
     # Authentication URLs
     path('register/', views.register, name='register'),
     path('login/', views.user_login, name='login'),
     path('logout/', views.user_logout, name='logout'),
     path('profile/', views.profile, name='profile'),
-    path('my-bookings/', views.my_bookings, name='my_bookings'),
+    path('my-bookings/', read_views.my_bookings, name='my_bookings'),
     path('booking/<int:booking_id>/', views.booking_detail, name='booking_detail'),
     path('booking/<int:booking_id>/cancel/', views.cancel_booking, name='cancel_booking'),
+    path('availability/<int:service_id>/', views.availability, name='availability'),
+    path('dashboard/', views.dashboard, name='dashboard'),
+    path('dispatch/', views.dispatch_plan, name='dispatch_plan'),
 
      # Password Reset URLs
     
     path('password_reset/', 
-         auth_views.PasswordResetView.as_view(template_name='auth/password_reset.html'), 
+         auth_views.PasswordResetView.as_view(template_name='auth/password_reset.html', form_class=QueuedPasswordResetForm), 
          name='password_reset'),
 
     path('password_reset/done/', 
@@ -38,7 +46,14 @@ urlpatterns = [
          auth_views.PasswordResetCompleteView.as_view(template_name='auth/password_reset_complete.html'), 
          name='password_reset_complete'),
     
-     path("recommendations/", views.ai_recommendations, name="ai_recommendations"),
+     path("recommendations/", read_views.ai_recommendations, name="ai_recommendations"),
+
+    # JSON API (see api.py)
+    path('api/services/', api.services, name='api_services'),
+    path('api/services/<int:service_id>/', api.service_detail, name='api_service_detail'),
+    path('api/services/<int:service_id>/availability/', api.availability, name='api_availability'),
+    path('api/bookings/', api.bookings, name='api_bookings'),
+    path('api/bookings/<int:booking_id>/cancel/', api.cancel_booking, name='api_cancel_booking'),
     
     
 ]
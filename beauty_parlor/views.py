@@ -1,16 +1,35 @@
+import datetime
+import time
+import uuid
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.core.paginator import Paginator
-from django.db.models import Q
-from .models import Service, Testimonial, Contact, Booking, UserProfile, Review
+from django.db import transaction
+from django.db.models import Prefetch
+from django.http import Http404, JsonResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.dateparse import parse_date
+from .models import Service, Testimonial, Contact, Booking, UserProfile, Review, Itinerary, ItineraryStop
+from . import availability as booking_availability
+from . import catalog_cache, jobs, rollups
+from .auth_cache import get_profile
+from .bookings import SlotUnavailable, create_booking, find_by_key
+from .conditional import conditional_on
 from .forms import ContactForm, BookingForm, UserRegistrationForm, UserProfileForm, ReviewForm
+from .pagination import keyset_page
+from .recommendations import recommended_services
+from .search import search_services
 
 def home(request):
-    services = Service.objects.filter(is_home_service=True)[:6]
-    testimonials = Testimonial.objects.all()[:3]
+    services = catalog_cache.fetch('home_services', [Service], lambda: list(Service.objects.filter(is_home_service=True)[:6]))
+    testimonials = catalog_cache.fetch('home_testimonials', [Testimonial], lambda: list(Testimonial.objects.all()[:3]))
     context = {
         'services': services,
         'testimonials': testimonials,
@@ -20,22 +39,39 @@ def home(request):
 def about(request):
     return render(request, 'beauty_parlor/about.html')
 
-def services(request):
-    category = request.GET.get('category', '')
-    search_query = request.GET.get('search', '')
-    
+def _services_filters(request):
+    sort = request.GET.get('sort', '')
+    if sort not in ('rating', 'price'):
+        sort = ''
+    try:
+        min_rating = min(max(int(request.GET.get('min_rating', 0)), 0), 5)
+    except ValueError:
+        min_rating = 0
+    return request.GET.get('category', ''), request.GET.get('search', ''), sort, min_rating
+
+def _services_queryset(category, search_query, sort, min_rating):
     services = Service.objects.all()
-    
     if category:
         services = services.filter(category=category)
-    
+    if min_rating:
+        services = services.filter(rating_average__gte=min_rating)
+    services = services.order_by('name')
     if search_query:
-        services = services.filter(
-            Q(name__icontains=search_query) | 
-            Q(description__icontains=search_query)
-        )
+        services = search_services(services, search_query, category=category)
+    # An explicit sort wins over search relevance
+    if sort == 'rating':
+        services = services.order_by('-rating_average', '-rating_count', 'name')
+    elif sort == 'price':
+        services = services.order_by('price', 'name')
+    return services
+
+@conditional_on(Service)
+def services(request):
+    filters = _services_filters(request)
+    category, search_query, sort, min_rating = filters
     
-    paginator = Paginator(services.order_by('name'), 9)
+    services = catalog_cache.fetch('services', [Service], lambda: list(_services_queryset(*filters)), *filters)
+    paginator = Paginator(services, 9)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
@@ -43,12 +79,23 @@ def services(request):
         'page_obj': page_obj,
         'category': category,
         'search_query': search_query,
+        'sort': sort,
+        'min_rating': min_rating,
+        'catalog_version': catalog_cache.versions(Service),
     }
     return render(request, 'beauty_parlor/services.html', context)
 
+@conditional_on(Service)
 def service_detail(request, service_id):
-    service = get_object_or_404(Service, id=service_id)
-    related_services = Service.objects.filter(category=service.category).exclude(id=service_id)[:3]
+    def build():
+        service = Service.objects.filter(id=service_id).first()
+        if service is None:
+            return None, []
+        return service, list(Service.objects.filter(category=service.category).exclude(id=service_id)[:3])
+    
+    service, related_services = catalog_cache.fetch('service_detail', [Service], build, service_id)
+    if service is None:
+        raise Http404('No Service matches the given query.')
     
     context = {
         'service': service,
@@ -60,7 +107,9 @@ def contact(request):
     if request.method == 'POST':
         form = ContactForm(request.POST)
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                contact = form.save()
+                jobs.enqueue('contact_received', {'contact_id': contact.pk})
             messages.success(request, 'Your message has been sent successfully!')
             return redirect('contact')
     else:
@@ -74,27 +123,55 @@ def contact(request):
 @login_required
 def booking(request):
     if request.method == 'POST':
+        idempotency_key = request.POST.get('idempotency_key', '')[:64]
+        # A resubmitted form gets its original booking back, even once the slot has passed
+        existing = find_by_key(request.user, idempotency_key)
+        if existing is not None:
+            messages.success(request, f'Booking request submitted successfully! Booking ID: {existing.id}')
+            return redirect('my_bookings')
         form = BookingForm(request.POST)
         if form.is_valid():
-            booking = form.save(commit=False)
-            booking.user = request.user  # Always set the user for new bookings
-            booking.save()
-            messages.success(request, f'Booking request submitted successfully! Booking ID: {booking.id}')
-            return redirect('my_bookings')
+            try:
+                booking, created = create_booking(form, request.user, idempotency_key)
+            except SlotUnavailable:
+                form.add_error('time', 'This time slot is already booked. Please choose another time.')
+            else:
+                messages.success(request, f'Booking request submitted successfully! Booking ID: {booking.id}')
+                return redirect('my_bookings')
     else:
         form = BookingForm()
+        idempotency_key = uuid.uuid4().hex
     
     services = Service.objects.filter(is_home_service=True)
     context = {
         'form': form,
         'services': services,
+        'idempotency_key': idempotency_key,
     }
     return render(request, 'beauty_parlor/booking.html', context)
 
+def availability(request, service_id):
+    service = get_object_or_404(Service, id=service_id)
+    day = _parse_date(request.GET.get('date'))
+    if day is None:
+        return JsonResponse({'error': 'Pass a date as YYYY-MM-DD.'}, status=400)
+
+    slots = booking_availability.free_slots(service, day)
+    response = JsonResponse({
+        'service': service.id,
+        'date': day.isoformat(),
+        'duration': service.duration,
+        'slots': [{'time': slot.strftime('%H:%M'), 'remaining': remaining} for slot, remaining in slots],
+    })
+    patch_cache_control(response, max_age=15)
+    return response
+
+@conditional_on(Testimonial)
 def testimonials(request):
-    testimonials = Testimonial.objects.all()
+    testimonials = catalog_cache.fetch('testimonials', [Testimonial], lambda: list(Testimonial.objects.all()))
     context = {
         'testimonials': testimonials,
+        'catalog_version': catalog_cache.versions(Testimonial),
     }
     return render(request, 'beauty_parlor/testimonials.html', context)
 
@@ -152,7 +229,7 @@ def user_logout(request):
 
 @login_required
 def profile(request):
-    user_profile, created = UserProfile.objects.get_or_create(user=request.user)
+    user_profile = get_profile(request.user)
     
     if request.method == 'POST':
         form = UserProfileForm(request.POST, request.FILES, instance=user_profile)
@@ -166,15 +243,47 @@ def profile(request):
     context = {
         'form': form,
         'user_profile': user_profile,
+        'booking_count': request.user.bookings.count(),
+        'review_count': request.user.reviews.count(),
+        'recent_bookings': request.user.bookings.select_related('service').order_by('-created_at', '-id')[:5],
     }
     return render(request, 'beauty_parlor/profile.html', context)
 
-@login_required
-def my_bookings(request):
-    bookings = Booking.objects.filter(user=request.user).order_by('-created_at')
+def _parse_date(value):
+    try:
+        return parse_date(value or '')
+    except ValueError:
+        return None
+
+def _my_bookings_query(request, user):
+    """The filtered bookings queryset and the filter context for my_bookings."""
+    status = request.GET.get('status', '')
+    date_from = _parse_date(request.GET.get('date_from'))
+    date_to = _parse_date(request.GET.get('date_to'))
+    status_choices = Booking._meta.get_field('status').choices
+
+    bookings = Booking.objects.filter(user=user).select_related('service')
+
+    if status in dict(status_choices):
+        bookings = bookings.filter(status=status)
+    if date_from:
+        bookings = bookings.filter(date__gte=date_from)
+    if date_to:
+        bookings = bookings.filter(date__lte=date_to)
+
     context = {
-        'bookings': bookings,
+        'is_first_page': not request.GET.get('cursor'),
+        'status': status,
+        'status_choices': status_choices,
+        'date_from': date_from,
+        'date_to': date_to,
     }
+    return bookings, context
+
+@login_required
+def my_bookings(request):
+    bookings, context = _my_bookings_query(request, request.user)
+    context['bookings'], context['next_cursor'] = keyset_page(bookings, request.GET.get('cursor'), page_size=20)
     return render(request, 'beauty_parlor/my_bookings.html', context)
 
 @login_required
@@ -215,19 +324,70 @@ def cancel_booking(request, booking_id):
 def ai_recommendations(request):
     category = request.GET.get("category", "")
     search_query = request.GET.get("search", "")
+    service_id = request.GET.get("service", "")
+
+    # Scores are precomputed by the refresh_recommendations command
+    source_service = None
+    if service_id.isdigit():
+        source_service = Service.objects.filter(id=service_id).first()
+    recommended = recommended_services(user=request.user, service=source_service)
+    if source_service is None and not recommended.exists():
+        recommended = Service.objects.all()
 
-    # Basic recommendation logic (you can make smarter later)
-    recommended = Service.objects.all()
     if category:
         recommended = recommended.filter(category__icontains=category)
     if search_query:
-        recommended = recommended.filter(
-            Q(name__icontains=search_query) | Q(description__icontains=search_query)
-        )
+        recommended = search_services(recommended, search_query)
 
     context = {
         "recommended": recommended[:9],  # limit results
         "category": category,
         "search_query": search_query,
+        "source_service": source_service,
     }
     return render(request, "beauty_parlor/recommendations.html", context)
+
+DASHBOARD_PERIODS = [7, 30, 90, 365]
+
+@staff_member_required
+def dashboard(request):
+    days = int(request.GET['days']) if request.GET.get('days', '').isdigit() else 30
+    if days not in DASHBOARD_PERIODS:
+        days = 30
+    end = timezone.localdate()
+    start = end - datetime.timedelta(days=days - 1)
+
+    started = time.perf_counter()
+    context = rollups.summary(start, end)
+    context.update({
+        'days': days,
+        'periods': DASHBOARD_PERIODS,
+        'start': start,
+        'end': end,
+        'revenue_statuses': rollups.REVENUE_STATUSES,
+        'query_ms': (time.perf_counter() - started) * 1000,
+    })
+    return render(request, 'beauty_parlor/dashboard.html', context)
+
+
+@staff_member_required
+def dispatch_plan(request):
+    day = _parse_date(request.POST.get('date') or request.GET.get('date'))
+    if day is None:
+        day = timezone.localdate() + datetime.timedelta(days=1)
+    if request.method == 'POST':
+        jobs.enqueue('plan_dispatch', {'date': day.isoformat()})
+        messages.success(request, f'Planning {day:%d %b %Y} in the background. Refresh in a moment.')
+        return redirect(f"{reverse('dispatch_plan')}?date={day.isoformat()}")
+
+    stops = ItineraryStop.objects.select_related('area', 'booking__service', 'booking__user')
+    itineraries = list(Itinerary.objects.filter(date=day).prefetch_related(Prefetch('stops', queryset=stops)))
+    context = {
+        'day': day,
+        'previous_day': day - datetime.timedelta(days=1),
+        'next_day': day + datetime.timedelta(days=1),
+        'itineraries': itineraries,
+        'visits': sum(itinerary.visits for itinerary in itineraries),
+        'planned_at': min((itinerary.planned_at for itinerary in itineraries), default=None),
+    }
+    return render(request, 'beauty_parlor/dispatch.html', context)
@@ -3,6 +3,7 @@ Django settings for roshni_beauty project.
 """
 
 from pathlib import Path
+import datetime
 import os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -24,6 +25,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.humanize',
     'beauty_parlor',
     'crispy_forms',
     'crispy_bootstrap5',
@@ -31,12 +33,15 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'beauty_parlor.middleware.RequestMetricsMiddleware',
+    'beauty_parlor.throttling.ThrottleMiddleware',
 ]
 
 ROOT_URLCONF = 'roshni_beauty.urls'
@@ -45,13 +50,21 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'beauty_parlor.context_processors.release',
+            ],
+            # Compile each template once per process. runserver's autoreloader resets
+            # the cache when a template changes, so this is safe with DEBUG on too.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
             ],
         },
     },
@@ -59,6 +72,14 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'roshni_beauty.wsgi.application'
 
+# Serve home, services, service detail, testimonials, my bookings and recommendations
+# from beauty_parlor.async_views. asgi.py turns this on; WSGI keeps the sync views.
+ASYNC_READ_VIEWS = os.environ.get('DJANGO_ASYNC_VIEWS') == '1'
+
+# Part of the catalog pages' ETags (beauty_parlor.conditional); set it per deploy
+# so browsers revalidate pages rendered by old templates.
+RELEASE_VERSION = os.environ.get('RELEASE_VERSION', '')
+
 # Database
 DATABASES = {
     'default': {
@@ -96,13 +117,107 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# collectstatic purges unused CSS, fingerprints every file and writes .gz/.br copies
+# (beauty_parlor/static_pipeline.py); WhiteNoise serves them with far-future headers.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'beauty_parlor.static_pipeline.PurgedManifestStaticFilesStorage',
+    },
+}
+STATIC_PURGE_CSS = ['css/*.css']
+# Classes only ever added by Bootstrap's JavaScript
+STATIC_PURGE_SAFELIST = ['show', 'showing', 'collapsing', 'active', 'fade', 'scrolled']
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Widths (px) of the resized/WebP copies generated next to uploaded images
+IMAGE_VARIANT_WIDTHS = (160, 320, 640, 960)
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Request metrics and profiling
+# REQUEST_METRICS=1 logs query count, DB/render/hashing time and duplicate queries for every request.
+# REQUEST_PROFILE_DIR=<path> turns on profiling: staff can profile a single request by sending
+# the header "X-Profile: 1", and the dumps go to that directory.
+# With both off the middleware removes itself and nothing is instrumented.
+REQUEST_METRICS_ENABLED = os.environ.get('REQUEST_METRICS') == '1'
+REQUEST_PROFILING_HEADER = 'HTTP_X_PROFILE'
+REQUEST_PROFILING_SAMPLE_RATE = 0.0
+REQUEST_PROFILE_DIR = os.environ.get('REQUEST_PROFILE_DIR') or None
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'beauty_parlor': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
+# Cache
+# Local memory by default; set CACHE_BACKEND=file to share one cache between worker processes
+if os.environ.get('CACHE_BACKEND') == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': BASE_DIR / 'cache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'roshni-beauty',
+        }
+    }
+# State that every worker process must agree on (POST throttle buckets, sessions, the
+# cached logged-in user) goes in a file cache, even when the default cache is per-process memory
+CACHES['shared'] = {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': BASE_DIR / 'cache' / 'shared',
+    'OPTIONS': {'MAX_ENTRIES': 20000},
+}
+CATALOG_CACHE_TIMEOUT = 60 * 15
+
+# Sessions: SESSION_MODE=db | cached_db | signed_cookies
+# cached_db reads sessions from the cache and falls back to the database;
+# signed_cookies keeps session data in a signed client-side cookie and needs no storage.
+SESSION_MODE = os.environ.get('SESSION_MODE', 'cached_db')
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}[SESSION_MODE]
+# A logout must end the session in every worker, not just the one that handled it
+SESSION_CACHE_ALIAS = 'shared'
+
+# The logged-in user and profile are cached briefly (beauty_parlor/auth_cache.py), in a cache
+# every worker shares so a password change, deactivation or lost staff status applies at once.
+# Sessions record the backend's path, so changing this list logs everyone out.
+AUTHENTICATION_BACKENDS = ['beauty_parlor.auth_cache.CachedModelBackend']
+AUTH_USER_CACHE = 'shared'
+AUTH_USER_CACHE_TIMEOUT = 60 * 5
+CATALOG_CACHE_STATS = True
+
+# Booking availability
+BOOKING_OPENING_TIME = datetime.time(9, 0)
+BOOKING_CLOSING_TIME = datetime.time(20, 0)
+BOOKING_SLOT_MINUTES = 30
+BOOKING_CAPACITY_PER_SERVICE = 1  # appointments of the same service that can run at once
+
 # Crispy Forms
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
@@ -125,3 +240,33 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
 # Password reset link expiration (in seconds, default 3 days)
 PASSWORD_RESET_TIMEOUT = 60 * 60 * 24 * 3
+
+# Background jobs (beauty_parlor/jobs.py), run by "python manage.py run_jobs"
+JOB_BATCH_SIZE = 50
+JOB_LOCK_TIMEOUT = 300  # seconds before a running job counts as stuck
+JOB_RETRY_BASE_SECONDS = 30
+
+# Unfiltered admin changelists of tables bigger than this show an estimated
+# row count instead of running COUNT(*) (beauty_parlor.pagination)
+ADMIN_EXACT_COUNT_LIMIT = 10000
+
+# POST throttling (beauty_parlor/throttling.py): URL name -> {bucket: "tokens/period"}.
+# "ip" is the client address, "user" the logged-in user, anything else a POST field.
+THROTTLE_RATES = {
+    'login': {'ip': '20/5m', 'username': '5/5m'},
+    'register': {'ip': '5/h'},
+    'contact': {'ip': '5/10m', 'email': '3/h'},
+    'booking': {'ip': '30/h', 'user': '10/h'},
+    'api_bookings': {'ip': '30/h', 'user': '10/h'},
+    'password_reset': {'ip': '5/h', 'email': '3/h'},
+}
+# Must be shared by all worker processes; beauty_parlor.W001 warns about per-process caches
+THROTTLE_CACHE = 'shared'
+# Behind a reverse proxy, e.g. 'HTTP_X_FORWARDED_FOR'; otherwise REMOTE_ADDR is used
+THROTTLE_CLIENT_IP_HEADER = os.environ.get('THROTTLE_CLIENT_IP_HEADER') or None
+
+# Home-visit dispatch planning (beauty_parlor/dispatch.py), run by "python manage.py plan_dispatch"
+DISPATCH_TRAVEL_SPEED_KMH = 18
+DISPATCH_BUFFER_MINUTES = 10  # parking, setup and pack-up around every visit
+DISPATCH_CLUSTER_RADIUS_KM = 5
+DISPATCH_UNRESOLVED_TRAVEL_MINUTES = 45